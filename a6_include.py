@@ -1,3 +1,8 @@
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+from os import urandom
+from struct import unpack_from
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -8,26 +13,23 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, pop, swap, get_at_index, set_at_index, length, filled, unchecked
     """
 
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
 
-    def __iter__(self):
-        """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
+    @classmethod
+    def filled(cls, length: int, value: object = None) -> "DynamicArray":
+        """Return a new array of the given length with every element set to value."""
+        da = cls()
+        da._data = [value] * length
+        return da
 
-        da = DynamicArray()
-        for value in da:        # will not work
-        min(da)                 # will not work
-        max(da)                 # will not work
-        sort(da)                # will not work
-        """
-        return None
+    def __iter__(self):
+        """Return an iterator over the elements of the array."""
+        return iter(self._data)
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -47,28 +49,138 @@ class DynamicArray:
 
     def get_at_index(self, index: int):
         """Return value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         return self._data[index]
 
     def __getitem__(self, index: int):
         """Return value of element at a given index using [] syntax."""
-        return self.get_at_index(index)
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        return self._data[index]
 
     def set_at_index(self, index: int, value: object) -> None:
         """Set value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         self._data[index] = value
 
     def __setitem__(self, index: int, value: object) -> None:
         """Set value of element at a given index using [] syntax."""
-        self.set_at_index(index, value)
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
 
     def length(self) -> int:
         """Return length of array."""
         return len(self._data)
 
+    def unchecked(self) -> list:
+        """
+        Return the list backing the array, for internal callers that keep
+        their indices in bounds. Indexing it skips the method calls and
+        bounds checks of [] syntax. It stays in sync with append and pop.
+        """
+        return self._data
+
+
+class GenerationArray(DynamicArray):
+    """
+    Dynamic Array whose elements are stamped with the generation they were
+    written in. clear() starts a new generation in O(1), after which every
+    element reads as None until it is written again; the stale values are
+    only dropped when their slot is overwritten.
+    """
+
+    def __init__(self, arr=None) -> None:
+        """Initialize new generation array using a list."""
+        super().__init__(arr)
+        self._stamps = [0] * len(self._data)
+        self._generation = 0
+
+    @classmethod
+    def filled(cls, length: int, value: object = None) -> "GenerationArray":
+        """Return a new array of the given length with every element set to value."""
+        da = cls()
+        da._data = [value] * length
+        da._stamps = [0] * length
+        return da
+
+    def __iter__(self):
+        """Return an iterator over the elements of the current generation."""
+        generation = self._generation
+        for value, stamp in zip(self._data, self._stamps):
+            yield value if stamp == generation else None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(list(self))
+
+    def __len__(self) -> int:
+        """Return length of array."""
+        return len(self._data)
+
+    def append(self, value: object) -> None:
+        """Add new element at the end of the array."""
+        self._data.append(value)
+        self._stamps.append(self._generation)
+
+    def pop(self):
+        """Remove element from end of the array and return it."""
+        stamp = self._stamps.pop()
+        value = self._data.pop()
+        return value if stamp == self._generation else None
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap two elements in array given their indices."""
+        self._data[i], self._data[j] = self._data[j], self._data[i]
+        self._stamps[i], self._stamps[j] = self._stamps[j], self._stamps[i]
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index, None if it is stale."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        if self._stamps[index] != self._generation:
+            return None
+        return self._data[index]
+
+    def __getitem__(self, index: int):
+        """Return value of element at a given index using [] syntax."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        if self._stamps[index] != self._generation:
+            return None
+        return self._data[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index, stamping it with the current generation."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
+        self._stamps[index] = self._generation
+
+    def __setitem__(self, index: int, value: object) -> None:
+        """Set value of element at a given index using [] syntax."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
+        self._stamps[index] = self._generation
+
+    def count(self, value: object) -> int:
+        """Return the number of elements of the current generation equal to value."""
+        return sum(1 for element in self if element == value)
+
+    def unchecked(self) -> "GenerationArray":
+        """
+        Return the array itself: every read has to check the element's
+        generation, so there is no plain list to hand out.
+        """
+        return self
+
+    def clear(self) -> None:
+        """Make every element read as None by starting a new generation."""
+        self._generation += 1
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -88,6 +200,156 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# ------------- Additional hash functions (SC & OA)  ------------- #
+# Each takes a str key and returns an int, so it can be passed as the
+# `function` argument of either HashMap.
+
+_FNV_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+_XXH_PRIME32_1 = 0x9E3779B1
+_XXH_PRIME32_2 = 0x85EBCA77
+_XXH_PRIME32_3 = 0xC2B2AE3D
+_XXH_PRIME32_4 = 0x27D4EB2F
+_XXH_PRIME32_5 = 0x165667B1
+
+
+def hash_function_builtin(key: str) -> int:
+    """
+    Adapter over the built-in hash (SipHash for str).
+    Fast, but str hashes are randomized per process unless PYTHONHASHSEED is set.
+    """
+    return hash(key)
+
+
+def hash_function_fnv1a(key: str) -> int:
+    """64-bit FNV-1a hash of the UTF-8 bytes of the key"""
+    hash = _FNV_OFFSET_BASIS
+    for byte in key.encode():
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash
+
+
+def _rotl32(value: int, count: int) -> int:
+    """Rotate a 32-bit value left by count bits"""
+    return ((value << count) | (value >> (32 - count))) & _MASK_32
+
+
+def _xxh32(data: bytes, seed: int) -> int:
+    """XXH32 digest of data, reading the input four bytes at a time"""
+    length = len(data)
+    index = 0
+
+    if length >= 16:
+        v1 = (seed + _XXH_PRIME32_1 + _XXH_PRIME32_2) & _MASK_32
+        v2 = (seed + _XXH_PRIME32_2) & _MASK_32
+        v3 = seed & _MASK_32
+        v4 = (seed - _XXH_PRIME32_1) & _MASK_32
+        limit = length - 16
+        while index <= limit:
+            lane1, lane2, lane3, lane4 = unpack_from('<4I', data, index)
+            v1 = _rotl32((v1 + lane1 * _XXH_PRIME32_2) & _MASK_32, 13) * _XXH_PRIME32_1 & _MASK_32
+            v2 = _rotl32((v2 + lane2 * _XXH_PRIME32_2) & _MASK_32, 13) * _XXH_PRIME32_1 & _MASK_32
+            v3 = _rotl32((v3 + lane3 * _XXH_PRIME32_2) & _MASK_32, 13) * _XXH_PRIME32_1 & _MASK_32
+            v4 = _rotl32((v4 + lane4 * _XXH_PRIME32_2) & _MASK_32, 13) * _XXH_PRIME32_1 & _MASK_32
+            index += 16
+        hash = (_rotl32(v1, 1) + _rotl32(v2, 7) + _rotl32(v3, 12) + _rotl32(v4, 18)) & _MASK_32
+    else:
+        hash = (seed + _XXH_PRIME32_5) & _MASK_32
+
+    hash = (hash + length) & _MASK_32
+
+    while index + 4 <= length:
+        lane, = unpack_from('<I', data, index)
+        hash = _rotl32((hash + lane * _XXH_PRIME32_3) & _MASK_32, 17) * _XXH_PRIME32_4 & _MASK_32
+        index += 4
+
+    while index < length:
+        hash = _rotl32((hash + data[index] * _XXH_PRIME32_5) & _MASK_32, 11) * _XXH_PRIME32_1 & _MASK_32
+        index += 1
+
+    hash ^= hash >> 15
+    hash = hash * _XXH_PRIME32_2 & _MASK_32
+    hash ^= hash >> 13
+    hash = hash * _XXH_PRIME32_3 & _MASK_32
+    hash ^= hash >> 16
+    return hash
+
+
+def hash_function_xxh32(key: str) -> int:
+    """XXH32 hash (seed 0) of the UTF-8 bytes of the key"""
+    return _xxh32(key.encode(), 0)
+
+
+class SeededHashFunction:
+    """
+    Keyed BLAKE2b hash of the UTF-8 bytes of a key. A class rather than a
+    closure, so maps using it can be pickled and sent to worker processes.
+    """
+
+    def __init__(self, seed: bytes) -> None:
+        """Remember the BLAKE2b key"""
+        self.seed = seed
+
+    def __call__(self, key: str) -> int:
+        """Return the keyed hash of key"""
+        digest = blake2b(key.encode(), digest_size=8, key=self.seed).digest()
+        return int.from_bytes(digest, 'little')
+
+
+def make_seeded_hash_function(seed: bytes = None) -> SeededHashFunction:
+    """
+    Return a keyed hash function for keys that may be chosen by an attacker.
+    It uses BLAKE2b keyed with seed (16 random bytes if none is given), so
+    colliding keys cannot be precomputed without knowing the seed.
+    """
+    if seed is None:
+        seed = urandom(16)
+    return SeededHashFunction(seed)
+
+
+# Primes that roughly double, used to pick a capacity without trial division.
+# From 11 on each entry is the first prime above twice the previous one,
+# which is the same growth the HashMaps get from _next_prime(2 * capacity).
+PRIME_LADDER = (
+    2, 3, 5, 7, 11, 23, 47, 97, 197, 397, 797, 1597, 3203, 6421, 12853,
+    25717, 51437, 102877, 205759, 411527, 823117, 1646237, 3292489,
+    6584983, 13169977, 26339969, 52679969, 105359939, 210719881,
+    421439783, 842879579, 1685759167, 3371518343, 6743036717
+)
+
+# 2**64 / golden ratio, the multiplier used by Fibonacci hashing
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def next_ladder_prime(capacity: int) -> int:
+    """
+    Return the smallest prime in PRIME_LADDER that is >= capacity,
+    or None if capacity is larger than the whole ladder.
+    """
+    index = bisect_left(PRIME_LADDER, capacity)
+    if index == len(PRIME_LADDER):
+        return None
+    return PRIME_LADDER[index]
+
+
+def next_power_of_two(capacity: int) -> int:
+    """Return the smallest power of two that is >= capacity."""
+    return 1 << max(capacity - 1, 0).bit_length()
+
+
+def fibonacci_index(hash_code: int, capacity: int) -> int:
+    """
+    Map a hash code to an index in a power of two sized table.
+    The hash is multiplied by FIBONACCI_MULTIPLIER and the top bits are kept,
+    so weak hashes are spread over all buckets instead of only using the low bits.
+    """
+    mixed = (hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF
+    return mixed >> (65 - capacity.bit_length())
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -95,11 +357,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash_code')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash_code: int = None) -> None:
+        """Initialize node given a key, value and optionally the key's hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash_code = hash_code
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -160,52 +426,215 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash_code: int = None,
+               pool: "NodePool" = None) -> None:
+        """
+        Insert new node at front of the list, caching the key's hash if given.
+        If a pool is given, the node is taken from it.
+        """
+        if pool is None:
+            self._head = SLNode(key, value, self._head, hash_code)
+        else:
+            self._head = pool.acquire(key, value, self._head, hash_code)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash_code: int = None, pool: "NodePool" = None) -> bool:
         """
         Remove first node with matching key.
+        If hash_code is given, keys are only compared on nodes with the same hash.
+        If a pool is given, the removed node is returned to it.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash_code is None or node.hash_code == hash_code) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
+                if pool is not None:
+                    pool.release(node)
                 return True
 
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash_code: int = None, reorder: str = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash_code is given, keys are only compared on nodes with the same hash.
+        reorder='move_to_front' moves a found node to the head of the list,
+        reorder='transpose' swaps it with the node before it.
+        """
+        if reorder is not None:
+            return self._contains_reorder(key, hash_code, reorder)
+
         node = self._head
+        if hash_code is None:
+            while node:
+                if node.key == key:
+                    return node
+                node = node.next
+            return node
+
         while node:
-            if node.key == key:
+            if node.hash_code == hash_code and node.key == key:
                 return node
             node = node.next
         return node
 
+    def _contains_reorder(self, key: str, hash_code: int, reorder: str) -> SLNode:
+        """Return node with matching key after moving it towards the head, or None."""
+        before, previous, node = None, None, self._head
+        while node:
+
+            if (hash_code is None or node.hash_code == hash_code) and node.key == key:
+                if previous:
+                    previous.next = node.next
+                    if reorder == 'move_to_front':
+                        node.next = self._head
+                        self._head = node
+                    else:
+                        node.next = previous
+                        if before:
+                            before.next = node
+                        else:
+                            self._head = node
+                return node
+
+            before, previous, node = previous, node, node.next
+        return None
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
 
+    def copy(self) -> "LinkedList":
+        """Return a list of new nodes with the same keys, values and hashes, in the same order."""
+        l_list = LinkedList()
+        tail = None
+        for node in self:
+            new_node = SLNode(node.key, node.value, None, node.hash_code)
+            if tail is None:
+                l_list._head = new_node
+            else:
+                tail.next = new_node
+            tail = new_node
+        l_list._size = self._size
+        return l_list
+
+
+class SortedChain:
+    """
+    Bucket for a hash map that keeps its nodes sorted by hash code, then by
+    key, so lookups are a binary search. Supports the same methods as
+    LinkedList, but every node must carry its hash code. Keys are only
+    compared with keys of the same hash code; insert raises TypeError if
+    the key cannot be ordered against them.
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize the chain from nodes with unique keys, e.g. a LinkedList."""
+        self._nodes = sorted(nodes, key=lambda node: (node.hash_code, node.key))
+        self._hashes = [node.hash_code for node in self._nodes]
+        self._keys = [node.key for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide the same output as LinkedList."""
+        return 'SLL [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in hash code and key order."""
+        return iter(self._nodes)
+
+    def _find(self, key: str, hash_code: int) -> int:
+        """Return the index of the node with matching key, or -1 if no match."""
+        lo = bisect_left(self._hashes, hash_code)
+        hi = bisect_right(self._hashes, hash_code, lo)
+        try:
+            i = bisect_left(self._keys, key, lo, hi)
+        except TypeError:
+            # the key does not order against keys of the same hash code
+            for i in range(lo, hi):
+                if self._keys[i] == key:
+                    return i
+            return -1
+        if i == hi or self._keys[i] != key:
+            return -1
+        return i
+
+    def insert(self, key: str, value: object, hash_code: int = None,
+               pool: "NodePool" = None) -> None:
+        """
+        Insert a new node in order, caching the key's hash.
+        If a pool is given, the node is taken from it.
+        Raise TypeError, leaving the chain unchanged, if the key cannot be
+        ordered against the keys with the same hash code.
+        """
+        lo = bisect_left(self._hashes, hash_code)
+        i = bisect_left(self._keys, key, lo, bisect_right(self._hashes, hash_code, lo))
+        self._hashes.insert(i, hash_code)
+        self._keys.insert(i, key)
+        if pool is None:
+            self._nodes.insert(i, SLNode(key, value, None, hash_code))
+        else:
+            self._nodes.insert(i, pool.acquire(key, value, None, hash_code))
+
+    def remove(self, key: str, hash_code: int = None, pool: "NodePool" = None) -> bool:
+        """
+        Remove the node with matching key.
+        If a pool is given, the removed node is returned to it.
+        Return True if removal was successful, False otherwise.
+        """
+        i = self._find(key, hash_code)
+        if i == -1:
+            return False
+
+        del self._hashes[i]
+        del self._keys[i]
+        node = self._nodes.pop(i)
+        if pool is not None:
+            pool.release(node)
+        return True
+
+    def contains(self, key: str, hash_code: int = None, reorder: str = None) -> SLNode:
+        """Return node with matching key, or None if no match; reorder is ignored."""
+        i = self._find(key, hash_code)
+        return None if i == -1 else self._nodes[i]
+
+    def length(self) -> int:
+        """Return the number of nodes in the chain."""
+        return len(self._nodes)
+
+    def copy(self) -> "SortedChain":
+        """Return a chain of new nodes with the same keys, values and hashes."""
+        chain = SortedChain()
+        chain._nodes = [SLNode(node.key, node.value, None, node.hash_code) for node in self._nodes]
+        chain._hashes = self._hashes.copy()
+        chain._keys = self._keys.copy()
+        return chain
+
+    def to_linked_list(self) -> LinkedList:
+        """Return a LinkedList holding the same keys, values and hashes."""
+        l_list = LinkedList()
+        for node in reversed(self._nodes):
+            l_list.insert(node.key, node.value, node.hash_code)
+        return l_list
+
 
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash_code', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash_code: int = None) -> None:
+        """Initialize an entry for use in a hash map, caching the key's hash if given."""
         self.key = key
         self.value = value
+        self.hash_code = hash_code
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -213,3 +642,47 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ------------- Node pooling (SC & OA)  ------------- #
+
+class NodePool:
+    """
+    Bounded free list of nodes (SLNode or HashEntry) that a hash map
+    draws from instead of allocating, and returns removed nodes to
+    """
+
+    def __init__(self, node_class: type, max_size: int = 1024) -> None:
+        """Initialize an empty pool that keeps at most max_size free nodes."""
+        self._node_class = node_class
+        self._max_size = max_size
+        self._free = []
+        self._hits = 0
+        self._misses = 0
+
+    def acquire(self, *args):
+        """Return a node initialized with args, reusing a free node if there is one."""
+        if self._free:
+            self._hits += 1
+            node = self._free.pop()
+            node.__init__(*args)
+            return node
+
+        self._misses += 1
+        return self._node_class(*args)
+
+    def release(self, node) -> None:
+        """Take back a node that is no longer referenced; dropped if the pool is full."""
+        if len(self._free) < self._max_size:
+            # don't keep the key and value alive while the node is free
+            node.__init__(None, None)
+            self._free.append(node)
+
+    def length(self) -> int:
+        """Return the number of free nodes in the pool."""
+        return len(self._free)
+
+    def stats(self) -> tuple:
+        """Return the hits, misses and hit rate of acquire calls."""
+        total = self._hits + self._misses
+        return self._hits, self._misses, self._hits / total if total else 0.0
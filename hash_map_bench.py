@@ -0,0 +1,822 @@
+# Description: Benchmarks for the SC and OA HashMap implementations
+#
+# Usage: python hash_map_bench.py [section ...]
+# With no arguments every section is run.
+
+import asyncio
+import gc
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, permutations
+
+import hash_map_concurrent
+import hash_map_oa
+import hash_map_rh
+import hash_map_server
+import hash_map_sc
+import hash_map_soa
+import hash_map_swiss
+from a6_include import (DynamicArray, DynamicArrayException,
+                        hash_function_1, hash_function_2, hash_function_builtin,
+                        hash_function_fnv1a, hash_function_xxh32,
+                        make_seeded_hash_function)
+
+
+def _best_of(func, repeat: int = 3) -> float:
+    """
+    Runs func the given number of times and returns the fastest run in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_oa_lookup(sizes=(1_000, 10_000, 100_000, 1_000_000), lookups: int = 10_000) -> None:
+    """
+    Per-lookup latency of the OA map should stay flat as the table grows.
+    """
+    print("\nOA get() latency vs. table size")
+    print("-------------------------------")
+    for n in sizes:
+        # hash_function_1/2 only spread short keys over a few thousand values,
+        # so the builtin hash is used to measure the probing itself
+        m = hash_map_oa.HashMap(11, hash)
+        for i in range(n):
+            m.put('key' + str(i), i)
+
+        step = max(1, n // lookups)
+        probe_keys = ['key' + str(i) for i in range(0, n, step)][:lookups]
+
+        def run():
+            for key in probe_keys:
+                m.get(key)
+
+        elapsed = _best_of(run)
+        print(f"{n:>9} keys: {elapsed / len(probe_keys) * 1e6:8.2f} us/get")
+
+
+def bench_sc_load(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """
+    Bulk loading the SC map should scale linearly with the number of keys.
+    """
+    print("\nSC put() bulk load")
+    print("------------------")
+    for n in sizes:
+        keys = ['key' + str(i) for i in range(n)]
+
+        def run():
+            m = hash_map_sc.HashMap(11, hash)
+            for i, key in enumerate(keys):
+                m.put(key, i)
+
+        elapsed = _best_of(run, repeat=1)
+        print(f"{n:>9} keys: {elapsed:7.2f} s ({elapsed / n * 1e6:.2f} us/put)")
+
+
+def bench_oa_memory(n: int = 100_000) -> None:
+    """
+    Table overhead per entry of the HashEntry layout vs. the struct-of-arrays layout.
+    Keys and values are created up front so only the table itself is measured.
+    """
+    print("\nOA memory per entry")
+    print("-------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    for name, module in (('HashEntry', hash_map_oa), ('struct of arrays', hash_map_soa)):
+        tracemalloc.start()
+        m = module.HashMap(11, hash)
+        for key in keys:
+            m.put(key, key)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>16}: {current / n:6.1f} bytes/entry "
+              f"(peak {peak / n:6.1f}), capacity {m.get_capacity()}")
+
+
+def bench_resize(n: int = 50_000, key_length: int = 200) -> None:
+    """
+    resize_table() cost with long string keys and the pure-Python hash_function_2.
+    """
+    print("\nresize_table() with long keys")
+    print("-----------------------------")
+    keys = [str(i).rjust(key_length, 'x') for i in range(n)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa), ('SoA', hash_map_soa)):
+        m = module.HashMap(4 * n, hash_function_2)
+        for key in keys:
+            m.put(key, key)
+        elapsed = _best_of(lambda: m.resize_table(m.get_capacity() * 2), repeat=1)
+        print(f"{name:>4}: {elapsed * 1e3:8.1f} ms for {n} keys")
+
+
+def bench_oa_churn(live: int = 10_000, rounds: int = 200_000) -> None:
+    """
+    Steady insert/delete traffic at a fixed live size: compaction keeps
+    tombstones, and so probe lengths, bounded.
+    """
+    print("\nOA insert/delete churn")
+    print("----------------------")
+    for name, module in (('OA', hash_map_oa), ('SoA', hash_map_soa)):
+        m = module.HashMap(11, hash)
+        for i in range(live):
+            m.put('key' + str(i), i)
+
+        start = time.perf_counter()
+        for i in range(live, live + rounds):
+            m.remove('key' + str(i - live))
+            m.put('key' + str(i), i)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>4}: {elapsed / rounds * 1e6:6.2f} us per remove+put, "
+              f"{m.get_tombstones()} tombstones, capacity {m.get_capacity()}")
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    """
+    Returns the sample at the given fraction of a sorted list.
+    """
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def bench_put_latency(n: int = 500_000, step: int = 8) -> None:
+    """
+    Worst-case put() latency with one-shot vs. incremental resizing.
+    The garbage collector is paused so its own pauses do not hide the resizes.
+    """
+    print("\nput() latency, one-shot vs. incremental resize")
+    print("-----------------------------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    clock = time.perf_counter
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for incremental_step in (0, step):
+            m = module.HashMap(11, hash, incremental_step=incremental_step)
+            samples = []
+            gc.disable()
+            for key in keys:
+                start = clock()
+                m.put(key, key)
+                samples.append(clock() - start)
+            gc.enable()
+            samples.sort()
+            print(f"{name} step={incremental_step}: p50 {_percentile(samples, 0.5) * 1e6:6.2f} us, "
+                  f"p99.99 {_percentile(samples, 0.9999) * 1e6:9.2f} us, "
+                  f"max {samples[-1] * 1e3:8.2f} ms")
+
+
+def bench_capacity_modes(n: int = 200_000) -> None:
+    """
+    Capacity selection and indexing cost of the 'prime', 'ladder' and 'pow2' modes.
+    """
+    print("\nCapacity modes")
+    print("--------------")
+    keys = ['key' + str(i) for i in range(n)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for mode in ('prime', 'ladder', 'pow2'):
+            m = module.HashMap(11, hash, capacity_mode=mode)
+            select = _best_of(lambda: [m._select_capacity(2 ** k + 1) for k in range(10, 33)])
+
+            def load():
+                m.clear()
+                for key in keys:
+                    m.put(key, key)
+
+            def lookup():
+                for key in keys:
+                    m.get(key)
+
+            put_time = _best_of(load, repeat=1)
+            get_time = _best_of(lookup)
+            print(f"{name} {mode:>6}: select capacity {select / 23 * 1e6:8.2f} us, "
+                  f"put {put_time / n * 1e6:5.2f} us, get {get_time / n * 1e6:5.2f} us, "
+                  f"capacity {m.get_capacity()}")
+
+
+def bench_hash_functions(n: int = 50_000, buckets: int = 1024) -> None:
+    """
+    Distribution quality and throughput of the hash functions in a6_include.
+    Quality is the chi-squared statistic of bucket counts divided by its
+    expected value (buckets - 1): ~1.0 is uniform, larger is worse.
+    """
+    print("\nHash functions")
+    print("--------------")
+    key_sets = {
+        'sequential': ['key' + str(i) for i in range(n)],
+        'anagrams': [''.join(p) for p in islice(permutations('abcdefghij'), n)],
+        'long': [str(i).rjust(64, '0') for i in range(n)],
+    }
+    functions = (
+        ('hash_function_1', hash_function_1),
+        ('hash_function_2', hash_function_2),
+        ('builtin', hash_function_builtin),
+        ('fnv1a', hash_function_fnv1a),
+        ('xxh32', hash_function_xxh32),
+        ('seeded', make_seeded_hash_function()),
+    )
+    for name, function in functions:
+        quality = []
+        for keys in key_sets.values():
+            counts = [0] * buckets
+            for key in keys:
+                counts[function(key) % buckets] += 1
+            expected = len(keys) / buckets
+            chi2 = sum((count - expected) ** 2 for count in counts) / expected
+            quality.append(f"{chi2 / (buckets - 1):8.1f}")
+
+        keys = key_sets['sequential']
+        elapsed = _best_of(lambda: [function(key) for key in keys])
+        print(f"{name:>16}: chi2 ratio sequential/anagrams/long {'/'.join(quality)}, "
+              f"{elapsed / n * 1e9:6.0f} ns/hash")
+
+
+def bench_bulk(n: int = 200_000) -> None:
+    """
+    put_many/get_many/remove_many throughput vs. looping put/get/remove.
+    """
+    print("\nBulk operations vs. loops")
+    print("-------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        def loop_put():
+            m = module.HashMap(11, hash)
+            for key, value in pairs:
+                m.put(key, value)
+            return m
+
+        def bulk_put():
+            m = module.HashMap(11, hash)
+            m.put_many(pairs)
+            return m
+
+        m = bulk_put()
+        results = []
+        for label, loop, bulk in (
+                ('put', loop_put, bulk_put),
+                ('get', lambda: [m.get(key) for key in keys], lambda: m.get_many(keys))):
+            loop_time = _best_of(loop, repeat=2)
+            bulk_time = _best_of(bulk, repeat=2)
+            results.append(f"{label} {n / loop_time / 1e3:6.0f} -> {n / bulk_time / 1e3:6.0f} "
+                           f"Kops/s ({loop_time / bulk_time:.1f}x)")
+
+        m_loop, m_bulk = bulk_put(), bulk_put()
+        start = time.perf_counter()
+        for key in keys:
+            m_loop.remove(key)
+        loop_time = time.perf_counter() - start
+        start = time.perf_counter()
+        m_bulk.remove_many(keys)
+        bulk_time = time.perf_counter() - start
+        results.append(f"remove {loop_time / bulk_time:.1f}x")
+        print(f"{name}: " + ', '.join(results))
+
+
+def bench_reserve(n: int = 500_000) -> None:
+    """
+    Loading N known items: put() from the default capacity, reserve() + put(), from_items().
+    """
+    print("\nLoading known item counts")
+    print("-------------------------")
+    pairs = [('key' + str(i), i) for i in range(n)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        def grow():
+            m = module.HashMap(11, hash)
+            for key, value in pairs:
+                m.put(key, value)
+
+        def reserve():
+            m = module.HashMap(11, hash)
+            m.reserve(n)
+            for key, value in pairs:
+                m.put(key, value)
+
+        grow_time = _best_of(grow, repeat=1)
+        reserve_time = _best_of(reserve, repeat=1)
+        from_items_time = _best_of(lambda: module.HashMap.from_items(pairs, hash), repeat=1)
+        print(f"{name}: put {grow_time:5.2f} s, reserve + put {reserve_time:5.2f} s, "
+              f"from_items {from_items_time:5.2f} s")
+
+
+def bench_probe_lengths(capacity: int = 100_003) -> None:
+    """
+    Probe-length mean, variance and maximum for quadratic probing and
+    Robin Hood linear probing at increasing load factors.
+    Quadratic probing in a prime table is only safe up to a load of 0.5.
+    """
+    print("\nProbe lengths by load factor")
+    print("----------------------------")
+    for load in (0.25, 0.5, 0.7, 0.8, 0.9):
+        n = int(load * capacity)
+        keys = ['key' + str(i) for i in range(n)]
+        maps = [('robin hood', hash_map_rh.HashMap(capacity, hash, max_load=0.95))]
+        if load <= 0.5:
+            maps.insert(0, ('quadratic', hash_map_oa.HashMap(capacity, hash)))
+        for name, m in maps:
+            m.put_many((key, key) for key in keys)
+            mean, variance, maximum = m.probe_stats()
+            elapsed = _best_of(lambda: m.get_many(keys))
+            print(f"load {load:4.2f} {name:>10}: mean {mean:5.2f}, variance {variance:6.2f}, "
+                  f"max {maximum:3}, get {elapsed / n * 1e6:5.2f} us")
+
+
+def bench_swiss(n: int = 112_000, lookups: int = 50_000) -> None:
+    """
+    Lookup hits and misses at high load for the control-byte table, with
+    bytes.find and, when NumPy is installed, NumPy group matching, against
+    Robin Hood probing at a similar load. The default n fills 131072
+    slots to a load of about 0.85.
+    NumPy pays a fixed cost per call, which outweighs comparing 16 bytes.
+    """
+    print("\nSwiss table group probing")
+    print("-------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    hits = keys[:lookups]
+    misses = ['miss' + str(i) for i in range(lookups)]
+
+    maps = [('robin hood', hash_map_rh.HashMap(131_071, hash, max_load=0.9)),
+            ('swiss bytes', hash_map_swiss.HashMap(n, hash, use_numpy=False))]
+    if hash_map_swiss.np is not None:
+        maps.append(('swiss numpy', hash_map_swiss.HashMap(n, hash, use_numpy=True)))
+    for name, m in maps:
+        for key in keys:
+            m.put(key, key)
+        hit = _best_of(lambda: [m.get(key) for key in hits])
+        miss = _best_of(lambda: [m.get(key) for key in misses])
+        print(f"{name:>11}: load {m.table_load():4.2f}, hit {hit / lookups * 1e6:5.2f} us, "
+              f"miss {miss / lookups * 1e6:5.2f} us")
+
+
+def bench_sc_treeify(n: int = 20_000, lookups: int = 2_000) -> None:
+    """
+    Lookups in a separate chaining map flooded with anagram keys, which all
+    share one hash_function_1 value, with and without sorted chains.
+    """
+    print("\nSC chain treeification under anagram flooding")
+    print("---------------------------------------------")
+    keys = [''.join(p) for p in islice(permutations('abcdefghij'), n)]
+    probes = keys[::n // lookups]
+    for threshold in (0, 8):
+        m = hash_map_sc.HashMap(n, hash_function_1, treeify_threshold=threshold)
+        build = _best_of(lambda: m.put_many((key, key) for key in keys), repeat=1)
+        elapsed = _best_of(lambda: [m.get(key) for key in probes])
+        name = 'linked list' if threshold == 0 else 'sorted chain'
+        print(f"{name:>12}: build {build:6.2f} s, get {elapsed / len(probes) * 1e6:8.2f} us")
+
+    # str and int keys cannot be ordered against each other, so a chain
+    # holding both stays a linked list past the threshold
+    m = hash_map_sc.HashMap(11, lambda key: 0)
+    mixed = list('abcdefg') + list(range(20))
+    for key in mixed:
+        m.put(key, key)
+    if m.get_size() != len(mixed) or any(m.get(key) != key for key in mixed):
+        raise AssertionError("mixed-type keys in one chain were lost")
+    print(f"{len(mixed)} colliding str and int keys in one chain: all found")
+
+
+def _chain_position(m: hash_map_sc.HashMap, key: str, hash_code: int) -> int:
+    """
+    Returns the number of nodes a lookup of key visits in its SC chain.
+    """
+    bucket = m._buckets[m._index(hash_code, m.get_capacity())]
+    for position, node in enumerate(bucket, 1):
+        if node.key == key:
+            return position
+    return bucket.length()
+
+
+def bench_sc_self_organize(n: int = 5_000, gets: int = 100_000, skew: float = 1.1) -> None:
+    """
+    Mean nodes visited per get under Zipf-distributed lookups, for each
+    self-organizing policy. hash_function_1 gives long anagram chains, and
+    treeification is off so the chains stay linked lists.
+    """
+    print("\nSC self-organizing chains under Zipf lookups")
+    print("--------------------------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    rnd = random.Random(0)
+    # rank popularity independently of insertion order
+    ranked = rnd.sample(keys, n)
+    weights = [1 / rank ** skew for rank in range(1, n + 1)]
+    lookups = rnd.choices(ranked, weights, k=gets)
+    hashes = {key: hash_function_1(key) for key in keys}
+
+    for policy in (None, 'transpose', 'move_to_front'):
+        m = hash_map_sc.HashMap(n, hash_function_1, treeify_threshold=0, self_organize=policy)
+        m.put_many((key, key) for key in keys)
+        visited = 0
+        for key in lookups:
+            visited += _chain_position(m, key, hashes[key])
+            m.get(key)
+        elapsed = _best_of(lambda: [m.get(key) for key in lookups])
+        print(f"{str(policy):>13}: {visited / gets:6.2f} nodes visited per get, "
+              f"{elapsed / gets * 1e6:5.2f} us per get")
+
+
+def _churn(m, keys: list, live: int) -> None:
+    """
+    Removes the oldest live key and puts a new one, for every key past live.
+    """
+    for i in range(live, len(keys)):
+        m.remove(keys[i - live])
+        m.put(keys[i], i)
+
+
+def bench_pool(live: int = 10_000, rounds: int = 200_000, pool_size: int = 1024) -> None:
+    """
+    Remove+put churn with and without a node pool. Every pool hit is a node
+    that was not allocated. Generation-0 collections run when allocations
+    outnumber frees, so they count the garbage that piles up (OA tombstones).
+    tracemalloc reports memory still held from allocations made during the
+    churn; timing is measured in a separate run without tracing.
+    """
+    print("\nNode pool under remove+put churn")
+    print("--------------------------------")
+    keys = ['key' + str(i) for i in range(live + rounds)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for size in (0, pool_size):
+            def build():
+                m = module.HashMap(2 * live, hash, pool_size=size)
+                for i in range(live):
+                    m.put(keys[i], i)
+                return m
+
+            m = build()
+            start = time.perf_counter()
+            _churn(m, keys, live)
+            elapsed = time.perf_counter() - start
+
+            m = build()
+            gc.collect()
+            collections = gc.get_stats()[0]['collections']
+            tracemalloc.start()
+            _churn(m, keys, live)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            collections = gc.get_stats()[0]['collections'] - collections
+
+            hits, misses, rate = m.pool_stats() or (0, 0, 0.0)
+            print(f"{name} pool {size:5}: {elapsed / rounds * 1e6:5.2f} us per remove+put, "
+                  f"hit rate {rate:6.1%} ({hits} reused, {misses} allocated), "
+                  f"{collections} gen-0 collections, traced {current / 1024:7.1f} KiB "
+                  f"(peak {peak / 1024:7.1f} KiB)")
+
+
+def bench_views(n: int = 200_000) -> None:
+    """
+    Extra memory and time to scan every pair: get_keys_and_values() copies
+    the table into a DynamicArray, items() streams it one pair at a time.
+    """
+    print("\nFull scans: get_keys_and_values() vs items()")
+    print("--------------------------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        m = module.HashMap(11, hash)
+        m.put_many((key, key) for key in keys)
+
+        def copy():
+            da = m.get_keys_and_values()
+            for i in range(da.length()):
+                da[i]
+
+        def stream():
+            for _ in m.items():
+                pass
+
+        for scan_name, scan in (('get_keys_and_values', copy), ('items', stream)):
+            tracemalloc.start()
+            scan()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            elapsed = _best_of(scan)
+            print(f"{name} {scan_name:>19}: {elapsed * 1e3:7.1f} ms, peak {peak / 1024:8.1f} KiB")
+
+
+class _LegacyDynamicArray(DynamicArray):
+    """
+    DynamicArray with the original access path, [] -> get_at_index -> length(),
+    kept to measure the per-access overhead that was removed.
+    """
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        if index < 0 or index >= self.length():
+            raise DynamicArrayException
+        return self._data[index]
+
+    def __getitem__(self, index: int):
+        """Return value of element at a given index using [] syntax."""
+        return self.get_at_index(index)
+
+
+def bench_dynamic_array(n: int = 1_000_000) -> None:
+    """
+    Per-element cost of DynamicArray reads, table construction and full scans.
+    """
+    print("\nDynamicArray access")
+    print("-------------------")
+    legacy = _LegacyDynamicArray([None] * n)
+    da = DynamicArray.filled(n)
+    data = da.unchecked()
+    indices = range(n)
+
+    def append_loop():
+        table = DynamicArray()
+        for _ in indices:
+            table.append(None)
+
+    def index_scan():
+        for i in range(da.length()):
+            da[i]
+
+    def iter_scan():
+        for _ in da:
+            pass
+
+    cases = (
+        ('read, original []', lambda: [legacy[i] for i in indices]),
+        ('read, []', lambda: [da[i] for i in indices]),
+        ('read, unchecked()', lambda: [data[i] for i in indices]),
+        ('build, append loop', append_loop),
+        ('build, filled()', lambda: DynamicArray.filled(n)),
+        ('scan, by index', index_scan),
+        ('scan, for loop', iter_scan),
+    )
+    for name, case in cases:
+        elapsed = _best_of(case)
+        print(f"{name:>19}: {elapsed / n * 1e9:6.1f} ns per element")
+
+
+def bench_sc_sparse(capacity: int = 1_000_000, n: int = 1_000) -> None:
+    """
+    Cost of SC tables that are mostly empty: creating one, and resizing a
+    table holding a few keys to a large capacity. Buckets only get a
+    LinkedList on first insert, so both scale with the keys, not the capacity.
+    """
+    print("\nSC sparse tables")
+    print("----------------")
+    keys = ['key' + str(i) for i in range(n)]
+
+    tracemalloc.start()
+    m = hash_map_sc.HashMap(capacity, hash)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    elapsed = _best_of(lambda: hash_map_sc.HashMap(capacity, hash))
+    print(f"new table, capacity {m.get_capacity()}: {elapsed * 1e3:7.1f} ms, {current / 1024:8.1f} KiB")
+
+    m = hash_map_sc.HashMap(11, hash)
+    m.put_many((key, key) for key in keys)
+    tracemalloc.start()
+    m.resize_table(capacity)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    elapsed = _best_of(lambda: m.resize_table(capacity))
+    print(f"resize {n} keys to {m.get_capacity()}: {elapsed * 1e3:7.1f} ms, {current / 1024:8.1f} KiB")
+
+
+def bench_clear(capacities=(1_000, 100_000, 1_000_000), keys_per_round: int = 100,
+                rounds: int = 200) -> None:
+    """
+    Scratch-map pattern: a few puts and gets into a large table, then clear().
+    With generations=True clear() only bumps the table's generation, at the
+    cost of a stamp check on every slot access.
+    """
+    print("\nclear() of scratch maps, rebuild vs. generation stamps")
+    print("------------------------------------------------------")
+    keys = ['key' + str(i) for i in range(keys_per_round)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for capacity in capacities:
+            for generations in (False, True):
+                m = module.HashMap(capacity, hash, generations=generations)
+
+                def scratch():
+                    for _ in range(rounds):
+                        for key in keys:
+                            m.put(key, key)
+                        for key in keys:
+                            m.get(key)
+                        m.clear()
+
+                elapsed = _best_of(scratch)
+                print(f"{name} capacity {m.get_capacity():>8} generations={str(generations):>5}: "
+                      f"{elapsed / rounds * 1e6:9.1f} us per round")
+
+
+def bench_occupancy(n: int = 200_000, polls: int = 1_000) -> None:
+    """
+    Polling empty_buckets() on a large map, as a monitoring loop would.
+    The maintained counters answer in O(1); the scan is what every call
+    used to cost.
+    """
+    print("\nempty_buckets() polling, maintained counters vs. full scan")
+    print("----------------------------------------------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        m = module.HashMap(n, hash)
+        m.put_many((key, key) for key in keys)
+        for mode, func in (('counters', m.empty_buckets),
+                           ('full scan', lambda: m._buckets.unchecked().count(None))):
+
+            def poll():
+                for _ in range(polls):
+                    func()
+
+            elapsed = _best_of(poll)
+            print(f"{name} capacity {m.get_capacity():>8} {mode:>9}: "
+                  f"{elapsed / polls * 1e6:10.2f} us per call")
+
+
+def bench_mode(n: int = 200_000, distinct: int = 5_000) -> None:
+    """
+    find_mode probes each element three times and scans the counts at the
+    end; stream_mode increments each count with one probe and tracks the
+    modes as it goes, reading its input as a stream of chunks.
+    """
+    print("\nfind_mode vs. single-pass stream_mode")
+    print("-------------------------------------")
+    rnd = random.Random(7)
+    values = ['v' + str(rnd.randrange(distinct)) for _ in range(n)]
+    da = DynamicArray(values)
+    chunks = [values[i:i + 4096] for i in range(0, n, 4096)]
+    for name, func in (('find_mode', lambda: hash_map_sc.find_mode(da)),
+                       ('stream_mode', lambda: hash_map_sc.stream_mode(iter(values))),
+                       ('stream_mode chunked', lambda: hash_map_sc.stream_mode(chunks, chunked=True))):
+        elapsed = _best_of(func)
+        print(f"{name:>19}: {elapsed * 1e3:8.1f} ms for {n} values")
+
+
+def bench_parallel_mode(n: int = 1_000_000, distinct: int = 50_000, workers=(1, 2, 4)) -> None:
+    """
+    parallel_mode against the serial stream_mode. Each worker pays for
+    shipping its chunks and partial counts between processes, so the
+    speedup only shows with as many cores as workers and inputs where
+    counting dominates that traffic.
+    """
+    print("\nparallel_mode across a process pool vs. serial stream_mode")
+    print("-----------------------------------------------------------")
+    rnd = random.Random(11)
+    values = ['v' + str(rnd.randrange(distinct)) for _ in range(n)]
+    start = time.perf_counter()
+    modes, freq = hash_map_sc.stream_mode(values)
+    elapsed = time.perf_counter() - start
+    expected = (sorted(modes), freq)
+    print(f"{'serial':>10}: {elapsed:7.2f} s for {n} values")
+    for count in workers:
+        start = time.perf_counter()
+        modes, freq = hash_map_sc.parallel_mode(values, workers=count)
+        elapsed = time.perf_counter() - start
+        if (sorted(modes), freq) != expected:
+            raise AssertionError(f"parallel_mode with {count} workers disagrees with stream_mode")
+        print(f"{count:>2} workers: {elapsed:7.2f} s for {n} values, same modes")
+
+
+def _stress(m, thread: int, ops: int, shared: int) -> None:
+    """
+    One stress worker: puts, reads back and removes keys of its own, and
+    increments counters every worker shares.
+    """
+    own = ['t' + str(thread) + 'k' + str(i) for i in range(ops)]
+    for i, key in enumerate(own):
+        m.put(key, i)
+        m.increment('shared' + str(i % shared))
+    for i, key in enumerate(own):
+        if m.get(key) != i:
+            raise AssertionError(f"{key} lost its value")
+    for key in own[::2]:
+        m.remove(key)
+
+
+def bench_concurrent(threads=(1, 2, 4, 8), ops: int = 10_000, shared: int = 64) -> None:
+    """
+    Thread-pool stress test of ConcurrentHashMap: checks that no update is
+    lost and measures throughput as threads are added. One shard is the
+    same as a single global lock. With the GIL threads take turns anyway,
+    so the shards only pay off on a free-threaded build.
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"\nConcurrentHashMap stress test, GIL {'enabled' if gil else 'disabled'}")
+    print("---------------------------------------------")
+    for name, map_class in (('SC', hash_map_sc.HashMap), ('OA', hash_map_oa.HashMap)):
+        for shards in (1, 16):
+            for count in threads:
+                m = hash_map_concurrent.ConcurrentHashMap(11, hash_function_builtin, shards=shards,
+                                                          map_class=map_class)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(count) as executor:
+                    for future in [executor.submit(_stress, m, t, ops, shared) for t in range(count)]:
+                        future.result()
+                elapsed = time.perf_counter() - start
+
+                if m.get_size() != count * ops // 2 + shared or \
+                        sum(m.get('shared' + str(i)) for i in range(shared)) != count * ops:
+                    raise AssertionError(f"{name} with {shards} shards and {count} threads lost updates")
+                print(f"{name} {shards:>2} shards {count:>2} threads: "
+                      f"{count * ops * 3.5 / elapsed / 1e3:8.1f} k ops/s")
+
+
+def bench_snapshot(n: int = 100_000, writes: int = 50_000) -> None:
+    """
+    Copy-on-write snapshots: taking one copies no chain or entry, the
+    first writes while it is held pay for copying the table and the chains
+    or entries they touch, writes after it is dropped run at full speed
+    again, and a reader thread scanning an old snapshot sees the same
+    contents however the writer grows and resizes the map.
+    """
+    print("\ncopy-on-write snapshots")
+    print("-----------------------")
+    keys = ['key' + str(i) for i in range(n)]
+    rnd = random.Random(5)
+    updates = [rnd.choice(keys) for _ in range(writes)]
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        m = module.HashMap(n, hash)
+        m.put_many((key, 0) for key in keys)
+
+        snap = None
+        for label in ('no snapshot', 'snapshot held', 'snapshot dropped'):
+            if label == 'snapshot held':
+                start = time.perf_counter()
+                snap = m.snapshot()
+                elapsed = time.perf_counter() - start
+                print(f"{name} snapshot() of {n} keys: {elapsed * 1e6:9.1f} us")
+            elif label == 'snapshot dropped':
+                snap = None
+            start = time.perf_counter()
+            for i, key in enumerate(updates):
+                m.put(key, i)
+            elapsed = time.perf_counter() - start
+            print(f"{name} {writes} updates, {label:>16}: {elapsed * 1e3:8.1f} ms")
+
+        snap = m.snapshot()
+        expected = dict(snap.items())
+        stop = threading.Event()
+        scans = [0]
+        failures = []
+
+        def reader():
+            while not stop.is_set():
+                if dict(snap.items()) != expected:
+                    failures.append(f"{name} snapshot changed under a writer")
+                    return
+                scans[0] += 1
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for i in range(n):
+            m.put('new' + str(i), i)
+            m.remove(keys[i])
+        stop.set()
+        thread.join()
+        if failures:
+            raise AssertionError(failures[0])
+        print(f"{name} reader scanned its snapshot {scans[0]} times during {2 * n} writes, unchanged")
+
+
+def bench_server(requests: int = 40_000, depths=(1, 8, 64)) -> None:
+    """
+    Loopback load against the asyncio key-value server. With a pipeline
+    depth of 1 every request pays a full round trip; deeper pipelines let
+    the server answer whole batches per read and the client send them
+    with one write per event loop tick.
+    """
+    print("\nkey-value server over loopback TCP, 4 connections, 80% gets")
+    print("-----------------------------------------------------------")
+    for name in ('sc', 'oa'):
+        for depth in depths:
+            report = asyncio.run(hash_map_server.run_loopback(name, requests=requests, depth=depth))
+            print(f"{name} depth {depth:>3}: {hash_map_server.format_report(report)}")
+
+
+SECTIONS = {
+    'oa_lookup': bench_oa_lookup,
+    'sc_load': bench_sc_load,
+    'oa_memory': bench_oa_memory,
+    'resize': bench_resize,
+    'oa_churn': bench_oa_churn,
+    'put_latency': bench_put_latency,
+    'capacity_modes': bench_capacity_modes,
+    'hash_functions': bench_hash_functions,
+    'bulk': bench_bulk,
+    'reserve': bench_reserve,
+    'probe_lengths': bench_probe_lengths,
+    'swiss': bench_swiss,
+    'sc_treeify': bench_sc_treeify,
+    'sc_self_organize': bench_sc_self_organize,
+    'pool': bench_pool,
+    'views': bench_views,
+    'dynamic_array': bench_dynamic_array,
+    'sc_sparse': bench_sc_sparse,
+    'clear': bench_clear,
+    'occupancy': bench_occupancy,
+    'mode': bench_mode,
+    'parallel_mode': bench_parallel_mode,
+    'concurrent': bench_concurrent,
+    'snapshot': bench_snapshot,
+    'server': bench_server,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or SECTIONS:
+        SECTIONS[name]()
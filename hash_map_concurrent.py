@@ -0,0 +1,316 @@
+# Description: Thread-safe HashMap that shards keys across inner HashMaps, each guarded by its own lock
+
+import threading
+
+import hash_map_sc
+from a6_include import DynamicArray, FIBONACCI_MULTIPLIER, next_power_of_two, hash_function_1, hash_function_2
+
+
+class ConcurrentHashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, shards: int = 16,
+                 map_class: type = hash_map_sc.HashMap, **kwargs) -> None:
+        """
+        Initialize new HashMap that can be shared between threads.
+        Keys are spread over shards inner maps of map_class (the SC or an OA
+        HashMap) by bits of their hash that the inner maps do not index
+        by, and every shard has its own lock, so threads working on
+        different shards do not wait for each other and a resize only
+        blocks the shard being resized.
+        The shard count is rounded up to a power of two, and capacity is
+        split evenly between the shards. Extra keyword arguments are passed
+        to every inner map. The hash function is called once to pick the
+        shard and again by the inner map.
+        """
+        shards = next_power_of_two(max(shards, 1))
+        self._hash_function = function
+        self._shard_count = shards
+        self._shards = [map_class(max(capacity // shards, 1), function, **kwargs)
+                        for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, (shard, lock) in enumerate(zip(self._shards, self._locks)):
+            with lock:
+                out += 'shard ' + str(i) + ':\n' + str(shard)
+        return out
+
+    def _shard_index(self, key: str) -> int:
+        """
+        Return the index of the shard holding key.
+        The shard comes from bits 32 and up of the Fibonacci hashing
+        multiply, which every bit of the hash feeds into. Inner maps index
+        buckets by the top bits of that product (pow2) or by a prime
+        modulus, so picking the shard never narrows their buckets.
+        """
+        return ((self._hash_function(key) * FIBONACCI_MULTIPLIER) >> 32) & (self._shard_count - 1)
+
+    def get_size(self) -> int:
+        """
+        Return the number of keys in all shards
+        """
+        size = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                size += shard.get_size()
+        return size
+
+    def get_capacity(self) -> int:
+        """
+        Return the combined capacity of all shards
+        """
+        capacity = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                capacity += shard.get_capacity()
+        return capacity
+
+    def get_shard_count(self) -> int:
+        """
+        Return the number of shards
+        """
+        return self._shard_count
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Insert or update a key-value pair, locking only the key's shard.
+
+        Params:
+            Key to be inserted or updated.
+            Value corresponding to the key.
+
+        Return: None
+        """
+        ind = self._shard_index(key)
+        with self._locks[ind]:
+            self._shards[ind].put(key, value)
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """
+        Atomically add amount to the value of a key, inserting the key with
+        value amount if it is absent.
+
+        Params:
+            Key whose value is incremented.
+            Amount to add.
+
+        Return: The new value of the key.
+        """
+        ind = self._shard_index(key)
+        shard = self._shards[ind]
+        with self._locks[ind]:
+            if hasattr(shard, 'increment'):
+                return shard.increment(key, amount)
+            value = shard.get(key)
+            value = amount if value is None else value + amount
+            shard.put(key, value)
+            return value
+
+    def get(self, key: str):
+        """
+        Get the value associated with the given key.
+
+        Params: Key to search for.
+
+        Return: The value associated with the key, or None if the key is not found.
+        """
+        ind = self._shard_index(key)
+        with self._locks[ind]:
+            return self._shards[ind].get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Check if the given key exists in the hash map.
+
+        Params: Key to check.
+
+        Return: True if the key exists, False otherwise.
+        """
+        ind = self._shard_index(key)
+        with self._locks[ind]:
+            return self._shards[ind].contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove the key-value pair with the given key from the hash map.
+
+        Params: Key to be removed.
+
+        Return: None
+        """
+        ind = self._shard_index(key)
+        with self._locks[ind]:
+            self._shards[ind].remove(key)
+
+    def empty_buckets(self) -> int:
+        """
+        Get the number of empty buckets in all shards.
+
+        Params: None
+
+        Return: Number of empty buckets.
+        """
+        empty = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                empty += shard.empty_buckets()
+        return empty
+
+    def table_load(self) -> float:
+        """
+        Get the load factor of the hash map, over the capacity of all shards.
+
+        Params: None
+
+        Return: Load factor of the hash map.
+        """
+        size = capacity = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                size += shard.get_size()
+                capacity += shard.get_capacity()
+        return size / capacity
+
+    def clear(self) -> None:
+        """
+        Clear every shard, one at a time.
+
+        Params: None
+
+        Return: None
+        """
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resize every shard to an even share of a new total capacity, one at a time.
+
+        Params: New capacity for the hash table.
+
+        Return: None
+        """
+        if new_capacity < 1:
+            return
+
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.resize_table(max(new_capacity // self._shard_count, 1))
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Get a dynamic array of key-value pairs in the hash map.
+        Each shard is copied under its lock, so pairs from one shard are
+        consistent with each other but not with concurrent changes to other shards.
+
+        Params: None
+
+        Return: Dynamic array of key-value pairs.
+        """
+        return DynamicArray(self._snapshot())
+
+    def _snapshot(self) -> list:
+        """
+        Return a list of the (key, value) pairs of every shard, each copied under its lock
+        """
+        pairs = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                pairs.extend(shard.items())
+        return pairs
+
+    def keys(self):
+        """
+        Yield the keys of a snapshot taken shard by shard, so other threads
+        may keep changing the map while the caller iterates.
+
+        Params: None
+
+        Return: Generator of keys.
+        """
+        for key, _ in self._snapshot():
+            yield key
+
+    def values(self):
+        """
+        Yield the values of a snapshot taken shard by shard.
+
+        Params: None
+
+        Return: Generator of values.
+        """
+        for _, value in self._snapshot():
+            yield value
+
+    def items(self):
+        """
+        Yield the (key, value) pairs of a snapshot taken shard by shard.
+
+        Params: None
+
+        Return: Generator of (key, value) tuples.
+        """
+        yield from self._snapshot()
+
+    def __iter__(self):
+        """
+        Return a new iterator over the (key, value) pairs of a snapshot
+        taken shard by shard. Unlike the inner maps, which hand out their
+        own entries, pairs are copied so they stay valid under other threads.
+
+        Params: None
+
+        Return: Generator of (key, value) tuples.
+        """
+        return self.items()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    import hash_map_oa
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = ConcurrentHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - contains_key example 2")
+    print("----------------------------")
+    m = ConcurrentHashMap(79, hash_function_2, map_class=hash_map_oa.HashMap)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nincrement from 8 threads")
+    print("------------------------")
+    for map_class in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        m = ConcurrentHashMap(shards=4, map_class=map_class)
+
+        def count(thread):
+            for i in range(2000):
+                m.increment('key' + str(i % 50))
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(count, range(8)))
+        print(m.get_size(), all(value == 8 * 2000 // 50 for value in m.values()))
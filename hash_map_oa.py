@@ -1,31 +1,219 @@
 # Description: HashMap implementation with Open Addressing and quadratic probing written in Python
 
-from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
+import copy
+import weakref
+
+from a6_include import (DynamicArray, GenerationArray, HashEntry, NodePool,
+                        FIBONACCI_MULTIPLIER, fibonacci_index, next_ladder_prime, next_power_of_two,
                         hash_function_1, hash_function_2)
 
+# left in the old table of an incremental resize once an entry has moved;
+# probing treats it as a tombstone
+_MIGRATED = HashEntry(None, None)
+_MIGRATED.is_tombstone = True
+
+
+class HashMapIterator:
+    """
+    Separate iterator class for HashMap, so every loop has its own position
+    """
+
+    def __init__(self, buckets: DynamicArray) -> None:
+        """Initialize the iterator at the first slot of a table."""
+        self._buckets = buckets
+        self._index = 0
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> HashEntry:
+        """Obtain the next live entry and advance the iterator."""
+        buckets = self._buckets.unchecked()
+        capacity = len(buckets)
+        while self._index < capacity:
+            entry = buckets[self._index]
+            self._index += 1
+            if entry is not None and entry.is_tombstone is False:
+                return entry
+
+        raise StopIteration
+
+
+class HashMapSnapshot:
+    """
+    Read-only view of an open addressing HashMap as it was when its
+    snapshot() method was called. The view keeps a shallow copy of the map
+    that is never written to; the map copies its table and replaces the
+    entries it changes instead of modifying them, so the view can be read
+    from any thread without locking while the map keeps taking writes.
+    """
+
+    def __init__(self, frozen: "HashMap") -> None:
+        """Initialize a view of a map copy that nothing writes to any more."""
+        self._map = frozen
+
+    def get_size(self) -> int:
+        """Return size of the map when the snapshot was taken."""
+        return self._map._size
+
+    def get_capacity(self) -> int:
+        """Return capacity of the map when the snapshot was taken."""
+        return self._map._capacity
+
+    def empty_buckets(self) -> int:
+        """Return the number of empty buckets when the snapshot was taken."""
+        return self._map._capacity - self._map._occupied
+
+    def table_load(self) -> float:
+        """Return the load factor when the snapshot was taken."""
+        return self._map._size / self._map._capacity
+
+    def get(self, key: str):
+        """
+        Returns the value the key had when the snapshot was taken.
+
+        Params: The key to search for.
+
+        Returns: The value associated with the key, or None if the key is not found.
+        """
+        frozen = self._map
+        ind = frozen._find_index(key, frozen._hash_function(key))
+        return None if ind == -1 else frozen._buckets[ind].value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks if the key was in the map when the snapshot was taken.
+
+        Params: The key to check for.
+
+        Returns: True if the key is found, False otherwise.
+        """
+        frozen = self._map
+        return frozen._find_index(key, frozen._hash_function(key)) != -1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array containing tuples of all key-value pairs in the snapshot.
+
+        Params: None
+
+        Returns: A dynamic array containing tuples of key-value pairs.
+        """
+        return DynamicArray(list(self.items()))
+
+    def keys(self):
+        """
+        Yields the keys of the snapshot one at a time.
+
+        Params: None
+
+        Returns: A generator of keys.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Yields the values of the snapshot one at a time.
+
+        Params: None
+
+        Returns: A generator of values.
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        Yields the (key, value) pairs of the snapshot one at a time.
+
+        Params: None
+
+        Returns: A generator of (key, value) tuples.
+        """
+        for entry in self._map._buckets:
+            if entry is not None and entry.is_tombstone is False:
+                yield entry.key, entry.value
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the (key, value) pairs of the snapshot.
+
+        Params: None
+
+        Returns: A generator of (key, value) tuples.
+        """
+        return self.items()
+
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    # the table grows once put would push the load factor past this;
+    # 0.5 guarantees quadratic probing in a prime table finds a free slot
+    _max_load = 0.5
+
+    def __init__(self, capacity: int, function, compact_threshold: float = 0.75,
+                 incremental_step: int = 0, capacity_mode: str = 'prime',
+                 pool_size: int = 0, generations: bool = False,
+                 debug: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        quadratic probing for collision resolution.
+        The table is rehashed at the same capacity once live entries
+        plus tombstones reach compact_threshold of the capacity.
+        With incremental_step > 0, resizes move that many old slots
+        per operation instead of rehashing everything at once.
+        capacity_mode selects how capacities are picked: 'prime' (next prime
+        by trial division), 'ladder' (precomputed PRIME_LADDER) or 'pow2'
+        (powers of two, indexed with Fibonacci hashing and probed with
+        triangular steps).
+        With pool_size > 0, tombstone entries leaving the table are kept in
+        a NodePool of that size and reused by later inserts. Entries handed
+        out by iteration may then be reused once their key is removed.
+        With generations=True the table is a GenerationArray, so clear()
+        takes O(1) time instead of rebuilding the table.
+        Occupied slots and tombstones are counted as the table changes, so
+        empty_buckets() does not scan it; debug=True cross-checks the
+        counters against a full scan whenever they are read.
+        snapshot() hands out read-only views of the map; after one is taken,
+        writes copy the table and replace the entries they change instead of
+        modifying what the view holds.
         """
-        self._buckets = DynamicArray()
+        if capacity_mode not in ('prime', 'ladder', 'pow2'):
+            raise ValueError(f"unknown capacity_mode: {capacity_mode!r}")
+        self._capacity_mode = capacity_mode
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        # capacity must be a prime number, or a power of two in 'pow2' mode
+        self._capacity = self._select_capacity(capacity)
+        self._generations = generations
+        self._table_class = GenerationArray if generations else DynamicArray
+        self._buckets = self._table_class.filled(self._capacity)
 
         self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+        # slots of the current table holding an entry or a tombstone
+        self._occupied = 0
+        self._debug = debug
+        self._compact_threshold = compact_threshold
+        self._pool = NodePool(HashEntry, pool_size) if pool_size else None
+
+        # old table of an incremental resize; slots below _migrate_index are moved
+        self._incremental_step = incremental_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # set while a snapshot may share the table array; _snapshots holds
+        # the live snapshots, which may share its entries as well
+        self._table_shared = False
+        self._snapshots = None
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_resize()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -78,6 +266,81 @@ class HashMap:
         """
         return self._capacity
 
+    def pool_stats(self) -> tuple:
+        """
+        Return the hits, misses and hit rate of the entry pool, or None without one
+        """
+        if self._pool is None:
+            return None
+        return self._pool.stats()
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstones in the table
+        """
+        if self._debug:
+            self.check_counters()
+        return self._tombstones
+
+    def check_counters(self) -> None:
+        """
+        Compare the size, tombstone and occupied-slot counters of the current
+        table against a full scan, raising AssertionError on a mismatch
+        """
+        size = tombstones = occupied = 0
+        for entry in self._buckets:
+            if entry is not None:
+                occupied += 1
+                if entry.is_tombstone:
+                    tombstones += 1
+                else:
+                    size += 1
+
+        # live entries still waiting in the old table of an incremental resize
+        if self._old_buckets is not None:
+            for entry in self._old_buckets:
+                if entry is not None and entry.is_tombstone is False:
+                    size += 1
+
+        counted = (self._size, self._tombstones, self._occupied)
+        if counted != (size, tombstones, occupied):
+            raise AssertionError(f"counters (size, tombstones, occupied) are {counted}, "
+                                 f"but the table holds {(size, tombstones, occupied)}")
+
+    def _select_capacity(self, capacity: int) -> int:
+        """
+        Return the capacity to use for a requested capacity: a power of two
+        in 'pow2' mode, otherwise a prime (looked up in PRIME_LADDER in 'ladder' mode)
+        """
+        if self._capacity_mode == 'pow2':
+            return next_power_of_two(capacity)
+
+        if self._capacity_mode == 'ladder':
+            prime = next_ladder_prime(capacity)
+            if prime is not None:
+                return prime
+
+        if self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
+
+    def _index(self, hash_code: int, capacity: int) -> int:
+        """
+        Return the bucket index of a hash code in a table of the given capacity
+        """
+        if self._capacity_mode == 'pow2':
+            return fibonacci_index(hash_code, capacity)
+        return hash_code % capacity
+
+    def _probe(self, initial_index: int, j: int, capacity: int) -> int:
+        """
+        Return the j-th index of the probe sequence starting at initial_index.
+        Power of two tables use triangular steps, which visit every slot.
+        """
+        if self._capacity_mode == 'pow2':
+            return (initial_index + (j * j + j) // 2) & (capacity - 1)
+        return (initial_index + j ** 2) % capacity
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
@@ -91,30 +354,105 @@ class HashMap:
         Returns: None
         """
 
-        if self.table_load() >= 0.5:
+        if self.table_load() >= self._max_load:
             new_cap = 2 * self._capacity
-            self.resize_table(new_cap)
+            if self._incremental_step:
+                self._start_resize(new_cap)
+            else:
+                self.resize_table(new_cap)
+        elif self._tombstones and \
+                (self._size + self._tombstones) / self._capacity >= self._compact_threshold:
+            self.compact()
+
+        # migrate only after the load check, so the new table always has room
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
 
         hash_code = self._hash_function(key)
-        initial_index = hash_code % self._capacity
 
-        if self._buckets[initial_index] is None or self._buckets[initial_index].is_tombstone:
-            self._buckets.set_at_index(initial_index, HashEntry(key, value))
-            self._size += 1
+        if self._old_buckets is not None:
+            ind = self._find_index(key, hash_code, self._old_buckets)
+            if ind != -1:
+                self._old_buckets[ind].value = value
+                return
+
+        self._insert(key, value, hash_code)
+
+    def _insert(self, key: str, value: object, hash_code: int) -> None:
+        """
+        Inserts or updates a key in the current table without any load checks.
+
+        Params:
+            - The key to be inserted.
+            - The value associated with the key.
+            - The key's hash code.
+
+        Returns: None
+        """
+        buckets = self._writable() if self._table_shared else self._buckets.unchecked()
+        initial_index = self._index(hash_code, self._capacity)
+
+        # reuse the first tombstone on the probe sequence, but only after
+        # checking that the key is not stored further along it
+        first_tombstone = -1
+        j = 0
+        ind = initial_index
+        while j < self._capacity:
+            entry = buckets[ind]
+            if entry is None:
+                break
+            if entry.is_tombstone:
+                if first_tombstone == -1:
+                    first_tombstone = ind
+            elif entry.hash_code == hash_code and entry.key == key:
+                if self._snapshots:
+                    buckets[ind] = HashEntry(key, value, hash_code)
+                else:
+                    entry.value = value
+                return
+
+            j += 1
+            ind = self._probe(initial_index, j, self._capacity)
+
+        if first_tombstone != -1:
+            ind = first_tombstone
+            self._tombstones -= 1
+            self._release(buckets[ind])
         else:
-            j = 0
-            ind = initial_index
-            while True:
-                if self._buckets[ind] is None or self._buckets[ind].is_tombstone:
-                    self._buckets.set_at_index(ind, HashEntry(key, value))
-                    self._size += 1
-                    return
-                elif self._buckets[ind].key == key:
-                    self._buckets[ind].value = value
-                    return
+            self._occupied += 1
 
-                j += 1
-                ind = (initial_index + j ** 2) % self._capacity
+        if self._pool is None:
+            buckets[ind] = HashEntry(key, value, hash_code)
+        else:
+            buckets[ind] = self._pool.acquire(key, value, hash_code)
+        self._size += 1
+
+    def _release(self, entry: HashEntry) -> None:
+        """
+        Returns a tombstone that is leaving the table to the entry pool, if there is one.
+        Entries a snapshot may still hold are left alone.
+
+        Params: The tombstone entry.
+
+        Returns: None
+        """
+        if self._pool is not None and entry is not _MIGRATED and not self._snapshots:
+            self._pool.release(entry)
+
+    def _writable(self) -> list:
+        """
+        Copies the table array on the first write after a snapshot shared it,
+        unless every snapshot has been dropped by then.
+
+        Params: None
+
+        Returns: The current table, as its unchecked list.
+        """
+        if self._table_shared:
+            if self._snapshots:
+                self._buckets = self._table_class(list(self._buckets))
+            self._table_shared = False
+        return self._buckets.unchecked()
 
     def table_load(self) -> float:
         """
@@ -129,49 +467,211 @@ class HashMap:
     def empty_buckets(self) -> int:
         """
         Returns the number of empty buckets in the hash table.
+        During an incremental resize this counts the new table only,
+        so polling it does not force the migration to finish.
 
         Params: None
 
         Returns: The number of empty buckets.
         """
-        empty_buckets = 0
-        for bucket in range(self._capacity):
-            if self._buckets[bucket] is None:
-                empty_buckets += 1
+        if self._debug:
+            self.check_counters()
 
-        return empty_buckets
+        return self._capacity - self._occupied
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Resizes the hash table to the given new capacity.
+        Entries keep their cached hash, so the hash function is not called again.
 
         Params: The new capacity.
 
         Returns: None
         """
-        old_cap = self._capacity
+        self._finish_resize()
 
         temp = self._buckets
 
         if new_capacity < self._size:
             return
 
-        if self._is_prime(new_capacity) is False:
-            self._capacity = self._next_prime(new_capacity)
+        new_capacity = self._select_capacity(new_capacity)
+
+        # grow the same way re-inserting every key through put() would
+        while self._size and (self._size - 1) / new_capacity >= self._max_load:
+            new_capacity = self._select_capacity(2 * new_capacity)
+
+        self._capacity = new_capacity
+
+        self._buckets = self._table_class.filled(self._capacity)
+        self._tombstones = 0
+        self._occupied = 0
+
+        # entries a snapshot may share are moved over as copies
+        shared = bool(self._snapshots)
+        for h_entry in temp:
+            if h_entry is not None:
+                if h_entry.is_tombstone is False:
+                    self._place(h_entry if not shared else
+                                HashEntry(h_entry.key, h_entry.value, h_entry.hash_code))
+                else:
+                    self._release(h_entry)
+
+        self._table_shared = False
+        self._snapshots = None
+
+    def compact(self) -> None:
+        """
+        Rehashes the table at its current capacity, dropping all tombstones.
+
+        Params: None
+
+        Returns: None
+        """
+        if self._incremental_step:
+            self._start_resize(self._capacity)
         else:
-            self._capacity = new_capacity
+            self.resize_table(self._capacity)
 
-        self._buckets = DynamicArray()
+    def _start_resize(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize: the current table becomes the old table
+        and its entries are moved over by later operations.
 
-        for bucket in range(self._capacity):
-            self._buckets.append(None)
+        Params: The new capacity.
 
-        self._size = 0
+        Returns: None
+        """
+        self._finish_resize()
+
+        # migrating would mark slots of a table a snapshot may share
+        if self._snapshots:
+            self.resize_table(new_capacity)
+            return
+
+        new_capacity = self._select_capacity(new_capacity)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+
+        self._capacity = new_capacity
+        self._buckets = self._table_class.filled(new_capacity)
+        self._tombstones = 0
+        self._occupied = 0
+
+    def _migrate(self, steps: int) -> None:
+        """
+        Moves the next slots of an incremental resize into the new table.
+
+        Params: The number of old slots to move.
+
+        Returns: None
+        """
+        old_buckets = self._old_buckets.unchecked()
+        end = min(self._migrate_index + steps, self._old_capacity)
+
+        for old_index in range(self._migrate_index, end):
+            entry = old_buckets[old_index]
+            if entry is not None and entry.is_tombstone is False:
+                self._place(entry)
+                old_buckets[old_index] = _MIGRATED
+
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_resize(self) -> None:
+        """
+        Completes any incremental resize still in progress.
+
+        Params: None
+
+        Returns: None
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Stores an entry in the first empty or tombstone slot of its probe sequence.
+        Only valid for keys known to be absent from the table, e.g. while resizing.
+
+        Params: The entry to store.
+
+        Returns: None
+        """
+        buckets = self._buckets.unchecked()
+        initial_index = self._index(entry.hash_code, self._capacity)
+
+        j = 0
+        ind = initial_index
+        while buckets[ind] is not None and buckets[ind].is_tombstone is False:
+            j += 1
+            ind = self._probe(initial_index, j, self._capacity)
+
+        if buckets[ind] is not None:
+            self._tombstones -= 1
+            self._release(buckets[ind])
+        else:
+            self._occupied += 1
+        buckets[ind] = entry
+
+    def _find_index(self, key: str, hash_code: int, buckets: DynamicArray = None) -> int:
+        """
+        Follows the quadratic probe sequence of the key, skipping tombstones.
+
+        Params:
+            - The key to search for.
+            - The key's hash code.
+            - The table to search, the current one by default.
+
+        Returns: Index of the live entry holding the key, or -1 if the key is not found.
+        """
+        if buckets is None:
+            buckets = self._buckets
+        buckets = buckets.unchecked()
+        capacity = len(buckets)
+        initial_index = self._index(hash_code, capacity)
+
+        j = 0
+        ind = initial_index
+        while j < capacity:
+            entry = buckets[ind]
+            if entry is None:
+                return -1
+            if not entry.is_tombstone and entry.hash_code == hash_code and entry.key == key:
+                return ind
+
+            j += 1
+            ind = self._probe(initial_index, j, capacity)
+
+        return -1
+
+    def _find_entry(self, key: str) -> HashEntry:
+        """
+        Looks a key up in the current table and, during an incremental
+        resize, in the old table.
+
+        Params: The key to search for.
+
+        Returns: The live entry holding the key, or None if the key is not found.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
 
-        for hash_entry in range(old_cap):
-            h_entry = temp[hash_entry]
-            if h_entry is not None and h_entry.is_tombstone is False:
-                self.put(h_entry.key, h_entry.value)
+        hash_code = self._hash_function(key)
+
+        ind = self._find_index(key, hash_code)
+        if ind != -1:
+            return self._buckets[ind]
+
+        if self._old_buckets is not None:
+            ind = self._find_index(key, hash_code, self._old_buckets)
+            if ind != -1:
+                return self._old_buckets[ind]
+
+        return None
 
     def get(self, key: str) -> object:
         """
@@ -181,12 +681,11 @@ class HashMap:
 
         Returns: The value associated with the key, or None if the key is not found.
         """
-        for table_key in range(self._capacity):
-            if self._buckets[table_key] is not None:
-                if self._buckets[table_key].key == key and self._buckets[table_key].is_tombstone is False:
-                    return self._buckets[table_key].value
+        entry = self._find_entry(key)
+        if entry is None:
+            return None
 
-        return None
+        return entry.value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -196,12 +695,7 @@ class HashMap:
 
         Returns: True if the key is found in the hash table, False otherwise.
         """
-        for entry in range(self._capacity):
-            if self._buckets[entry] is not None:
-                if self._buckets[entry].key == key and self._buckets[entry].is_tombstone is False:
-                    return True
-
-        return False
+        return self._find_entry(key) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -211,11 +705,25 @@ class HashMap:
 
         Returns: None
         """
-        for entry in range(self._capacity):
-            if self._buckets[entry] is not None:
-                if self._buckets[entry].key == key and self._buckets[entry].is_tombstone is False:
-                    self._buckets[entry].is_tombstone = True
-                    self._size -= 1
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
+
+        hash_code = self._hash_function(key)
+
+        ind = self._find_index(key, hash_code)
+        if ind != -1:
+            if self._snapshots:
+                entry = self._buckets[ind]
+                self._writable()[ind] = HashEntry(entry.key, entry.value, entry.hash_code)
+            self._buckets[ind].is_tombstone = True
+            self._size -= 1
+            self._tombstones += 1
+        elif self._old_buckets is not None:
+            # tombstones left in the old table are dropped with it
+            ind = self._find_index(key, hash_code, self._old_buckets)
+            if ind != -1:
+                self._old_buckets[ind].is_tombstone = True
+                self._size -= 1
 
     def clear(self) -> None:
         """
@@ -225,11 +733,16 @@ class HashMap:
 
         Returns: None
         """
-        self._buckets = DynamicArray()
+        self._old_buckets = None
+        if self._generations and not self._table_shared:
+            self._buckets.clear()
+        else:
+            self._buckets = self._table_class.filled(self._capacity)
         self._size = 0
-
-        for bucket in range(self._capacity):
-            self._buckets.append(None)
+        self._tombstones = 0
+        self._occupied = 0
+        self._table_shared = False
+        self._snapshots = None
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -239,46 +752,326 @@ class HashMap:
 
         Returns: A dynamic array containing tuples of key-value pairs.
         """
+        self._finish_resize()
         da = DynamicArray()
 
-        for entry in range(self._capacity):
-            if self._buckets[entry] is not None and self._buckets[entry].is_tombstone is False:
-                da.append((self._buckets[entry].key, self._buckets[entry].value))
+        for entry in self._buckets:
+            if entry is not None and entry.is_tombstone is False:
+                da.append((entry.key, entry.value))
 
         return da
 
-    def __iter__(self):
+    def snapshot(self) -> HashMapSnapshot:
         """
-        Returns an iterator object for iterating over the hash map.
+        Takes a read-only view of the map as it is now, in O(1) once any
+        incremental resize has finished. The view shares the table and its
+        entries with the map; later writes copy the table once and replace
+        each entry they change, so views of older versions share every
+        untouched entry. Once every view is dropped, writes go back to
+        changing entries in place and returning them to the pool.
 
         Params: None
 
-        Returns: The iterator object.
+        Returns: A HashMapSnapshot of the current keys and values.
         """
-        self._index = 0
+        self._finish_resize()
+        self._table_shared = True
+        if self._snapshots is None:
+            self._snapshots = weakref.WeakSet()
+        view = HashMapSnapshot(copy.copy(self))
+        self._snapshots.add(view)
+        return view
+
+    def reserve(self, count: int) -> None:
+        """
+        Grows the table once, if needed, so that count entries fit
+        under the load factor without any further resizes.
 
-        return self
+        Params: The number of entries the table must hold.
+
+        Returns: None
+        """
+        if count and (count - 1) / self._capacity >= self._max_load:
+            self.resize_table(int((count - 1) / self._max_load) + 1)
+
+    @classmethod
+    def from_items(cls, items, function, **kwargs) -> "HashMap":
+        """
+        Builds a map from key-value pairs in a single pass,
+        allocating a table large enough that no resize is needed.
+
+        Params:
+            - An iterable of (key, value) pairs.
+            - The hash function for the map.
+            - Any other HashMap constructor arguments.
+
+        Returns: The new HashMap.
+        """
+        items = list(items)
+        h_map = cls(1, function, **kwargs)
+        h_map.put_many(items)
+        return h_map
 
-    def __next__(self):
+    def probe_stats(self) -> tuple:
         """
-        Returns the next key-value pair in the hash map during iteration.
+        Measures how many probes it takes to reach each stored entry.
 
         Params: None
 
-        Returns: The next key-value pair.
+        Returns: A tuple of the mean, variance and maximum probe length.
+        """
+        self._finish_resize()
+
+        lengths = []
+        for ind, entry in enumerate(self._buckets):
+            if entry is not None and entry.is_tombstone is False:
+                lengths.append(self._probe_length(ind, entry))
+
+        if not lengths:
+            return 0, 0, 0
+
+        mean = sum(lengths) / len(lengths)
+        variance = sum((length - mean) ** 2 for length in lengths) / len(lengths)
+        return mean, variance, max(lengths)
+
+    def _probe_length(self, ind: int, entry: HashEntry) -> int:
+        """
+        Counts the probes needed to reach an entry from its home slot.
+
+        Params:
+            - The index the entry is stored at.
+            - The stored entry.
+
+        Returns: The number of slots probed, 1 if the entry is in its home slot.
+        """
+        initial_index = self._index(entry.hash_code, self._capacity)
+
+        j = 0
+        probe = initial_index
+        while probe != ind:
+            j += 1
+            probe = self._probe(initial_index, j, self._capacity)
+
+        return j + 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Inserts or updates many key-value pairs.
+        The table is sized once for the case where every key is new,
+        then the pairs are inserted without per-call load checks.
+        The home slot and probe steps for the current capacity mode are
+        computed inline instead of through _index() and _probe().
+
+        Params: An iterable of (key, value) pairs.
+
+        Returns: None
+        """
+        pairs = list(pairs)
+        self._finish_resize()
+        self.reserve(self._size + len(pairs))
+        if self._tombstones and \
+                (self._size + self._tombstones + len(pairs)) / self._capacity >= self._compact_threshold:
+            self.compact()
+            self._finish_resize()
+
+        hash_function = self._hash_function
+        buckets = self._writable() if self._table_shared else self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        mask = capacity - 1
+        pool = self._pool
+        cow = bool(self._snapshots)
+        added = 0
+        # keys inserted before a hash function raises still count towards the size
+        try:
+            for key, value in pairs:
+                hash_code = hash_function(key)
+                if pow2:
+                    initial_index = ((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+                else:
+                    initial_index = hash_code % capacity
+
+                # same probe loop as _insert()
+                first_tombstone = -1
+                j = 0
+                ind = initial_index
+                while j < capacity:
+                    entry = buckets[ind]
+                    if entry is None:
+                        break
+                    if entry.is_tombstone:
+                        if first_tombstone == -1:
+                            first_tombstone = ind
+                    elif entry.hash_code == hash_code and entry.key == key:
+                        break
+                    j += 1
+                    if pow2:
+                        ind = (initial_index + (j * j + j) // 2) & mask
+                    else:
+                        ind = (initial_index + j * j) % capacity
+                else:
+                    entry = None
+
+                if entry is not None and not entry.is_tombstone:
+                    if cow:
+                        buckets[ind] = HashEntry(key, value, hash_code)
+                    else:
+                        entry.value = value
+                    continue
+
+                if first_tombstone != -1:
+                    ind = first_tombstone
+                    self._tombstones -= 1
+                    self._release(buckets[ind])
+                else:
+                    self._occupied += 1
+
+                if pool is None:
+                    buckets[ind] = HashEntry(key, value, hash_code)
+                else:
+                    buckets[ind] = pool.acquire(key, value, hash_code)
+                added += 1
+        finally:
+            self._size += added
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up many keys at once, probing inline as in put_many().
+
+        Params: An iterable of keys.
+
+        Returns: A dynamic array with the value of each key, or None for keys not found.
+        """
+        self._finish_resize()
+
+        hash_function = self._hash_function
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        mask = capacity - 1
+        values = []
+        append = values.append
+        for key in keys:
+            hash_code = hash_function(key)
+            if pow2:
+                initial_index = ((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+            else:
+                initial_index = hash_code % capacity
+
+            value = None
+            j = 0
+            ind = initial_index
+            while j < capacity:
+                entry = buckets[ind]
+                if entry is None:
+                    break
+                if not entry.is_tombstone and entry.hash_code == hash_code and entry.key == key:
+                    value = entry.value
+                    break
+                j += 1
+                if pow2:
+                    ind = (initial_index + (j * j + j) // 2) & mask
+                else:
+                    ind = (initial_index + j * j) % capacity
+            append(value)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes many keys at once, probing inline as in put_many();
+        keys that are not found are ignored.
+
+        Params: An iterable of keys.
+
+        Returns: None
         """
+        self._finish_resize()
+
+        hash_function = self._hash_function
+        buckets = self._writable() if self._table_shared else self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        mask = capacity - 1
+        cow = bool(self._snapshots)
+        removed = 0
         try:
-            while self._buckets[self._index] is None or self._buckets[self._index].is_tombstone is True:
-                self._index = self._index + 1
+            for key in keys:
+                hash_code = hash_function(key)
+                if pow2:
+                    initial_index = ((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+                else:
+                    initial_index = hash_code % capacity
+
+                j = 0
+                ind = initial_index
+                while j < capacity:
+                    entry = buckets[ind]
+                    if entry is None:
+                        break
+                    if not entry.is_tombstone and entry.hash_code == hash_code and entry.key == key:
+                        if cow:
+                            entry = buckets[ind] = HashEntry(entry.key, entry.value, hash_code)
+                        entry.is_tombstone = True
+                        removed += 1
+                        break
+                    j += 1
+                    if pow2:
+                        ind = (initial_index + (j * j + j) // 2) & mask
+                    else:
+                        ind = (initial_index + j * j) % capacity
+        finally:
+            self._size -= removed
+            self._tombstones += removed
+
+    def keys(self):
+        """
+        Yields the keys one at a time without copying the table.
+
+        Params: None
 
-            value = self._buckets[self._index]
+        Returns: A generator of keys.
+        """
+        for entry in self:
+            yield entry.key
 
-            self._index = self._index + 1
+    def values(self):
+        """
+        Yields the values one at a time without copying the table.
 
-            return value
+        Params: None
+
+        Returns: A generator of values.
+        """
+        for entry in self:
+            yield entry.value
+
+    def items(self):
+        """
+        Yields the key-value pairs one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of (key, value) tuples.
+        """
+        for entry in self:
+            yield entry.key, entry.value
+
+    def __iter__(self) -> HashMapIterator:
+        """
+        Returns a new iterator over the live entries of the hash map.
+        Each iterator keeps its own position, so loops can be nested.
+
+        Params: None
+
+        Returns: The iterator object.
+        """
+        self._finish_resize()
 
-        except DynamicArrayException:
-            raise StopIteration
+        return HashMapIterator(self._buckets)
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
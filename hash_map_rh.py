@@ -0,0 +1,295 @@
+# Description: HashMap implementation with Open Addressing and Robin Hood linear probing
+# with backward-shift deletion, built on the quadratic probing HashMap
+
+import hash_map_oa
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2, hash_function_xxh32)
+
+
+class HashMap(hash_map_oa.HashMap):
+    def __init__(self, capacity: int, function, max_load: float = 0.9,
+                 capacity_mode: str = 'prime', debug: bool = False) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing for
+        collision resolution: an entry being inserted takes the slot of any
+        resident that is closer to its home slot. Removal shifts the
+        following entries back, so the table never holds tombstones and can
+        run at load factors up to max_load.
+        Incremental resizing is not supported, since backward shifts
+        would move entries across the migration cursor.
+        """
+        super().__init__(capacity, function, capacity_mode=capacity_mode, debug=debug)
+        self._max_load = max_load
+
+    def _distance(self, ind: int, hash_code: int, capacity: int) -> int:
+        """
+        Returns how far the slot at ind is from the home slot of hash_code.
+        """
+        return (ind - self._index(hash_code, capacity)) % capacity
+
+    def _probe_length(self, ind: int, entry: HashEntry) -> int:
+        """
+        Counts the probes needed to reach an entry from its home slot.
+
+        Params:
+            - The index the entry is stored at.
+            - The stored entry.
+
+        Returns: The number of slots probed, 1 if the entry is in its home slot.
+        """
+        return self._distance(ind, entry.hash_code, self._capacity) + 1
+
+    def _insert(self, key: str, value: object, hash_code: int) -> None:
+        """
+        Inserts or updates a key in the table without any load checks.
+
+        Params:
+            - The key to be inserted.
+            - The value associated with the key.
+            - The key's hash code.
+
+        Returns: None
+        """
+        capacity = self._capacity
+        buckets = self._writable() if self._table_shared else self._buckets.unchecked()
+        ind = self._index(hash_code, capacity)
+
+        # a key can only be stored before the first resident that is
+        # closer to its home than we are to ours
+        dist = 0
+        while True:
+            entry = buckets[ind]
+            if entry is None:
+                break
+            if entry.hash_code == hash_code and entry.key == key:
+                if self._snapshots:
+                    buckets[ind] = HashEntry(key, value, hash_code)
+                else:
+                    entry.value = value
+                return
+            if self._distance(ind, entry.hash_code, capacity) < dist:
+                break
+
+            dist += 1
+            ind = ind + 1 if ind + 1 < capacity else 0
+
+        self._size += 1
+        self._shift_in(HashEntry(key, value, hash_code), ind, dist)
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Stores an entry known to be absent from the table, e.g. while resizing.
+
+        Params: The entry to store.
+
+        Returns: None
+        """
+        capacity = self._capacity
+        buckets = self._buckets.unchecked()
+        ind = self._index(entry.hash_code, capacity)
+
+        dist = 0
+        while buckets[ind] is not None and \
+                self._distance(ind, buckets[ind].hash_code, capacity) >= dist:
+            dist += 1
+            ind = ind + 1 if ind + 1 < capacity else 0
+
+        self._shift_in(entry, ind, dist)
+
+    def _shift_in(self, entry: HashEntry, ind: int, dist: int) -> None:
+        """
+        Stores an entry at ind, at the given distance from its home slot,
+        pushing displaced residents further along until an empty slot is found.
+
+        Params:
+            - The entry to store.
+            - The index to store it at.
+            - The entry's distance from its home slot at that index.
+
+        Returns: None
+        """
+        capacity = self._capacity
+        buckets = self._buckets.unchecked()
+
+        while True:
+            resident = buckets[ind]
+            buckets[ind] = entry
+            if resident is None:
+                self._occupied += 1
+                return
+
+            # the displaced resident continues from its own distance
+            entry = resident
+            dist = self._distance(ind, resident.hash_code, capacity)
+            while True:
+                dist += 1
+                ind = ind + 1 if ind + 1 < capacity else 0
+                resident = buckets[ind]
+                if resident is None or \
+                        self._distance(ind, resident.hash_code, capacity) < dist:
+                    break
+
+    def _find_index(self, key: str, hash_code: int, buckets: DynamicArray = None) -> int:
+        """
+        Probes linearly from the key's home slot, stopping early at the first
+        resident that is closer to its home than the key would be.
+
+        Params:
+            - The key to search for.
+            - The key's hash code.
+            - The table to search, the current one by default.
+
+        Returns: Index of the entry holding the key, or -1 if the key is not found.
+        """
+        if buckets is None:
+            buckets = self._buckets
+        buckets = buckets.unchecked()
+        capacity = len(buckets)
+        ind = self._index(hash_code, capacity)
+
+        dist = 0
+        while dist < capacity:
+            entry = buckets[ind]
+            if entry is None:
+                return -1
+            if entry.hash_code == hash_code and entry.key == key:
+                return ind
+            if self._distance(ind, entry.hash_code, capacity) < dist:
+                return -1
+
+            dist += 1
+            ind = ind + 1 if ind + 1 < capacity else 0
+
+        return -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key-value pair associated with the specified key,
+        shifting the following displaced entries back by one slot.
+
+        Params: The key to be removed.
+
+        Returns: None
+        """
+        ind = self._find_index(key, self._hash_function(key))
+        if ind == -1:
+            return
+
+        capacity = self._capacity
+        buckets = self._writable() if self._table_shared else self._buckets.unchecked()
+        nxt = ind + 1 if ind + 1 < capacity else 0
+        while buckets[nxt] is not None and \
+                self._distance(nxt, buckets[nxt].hash_code, capacity) > 0:
+            buckets[ind] = buckets[nxt]
+            ind = nxt
+            nxt = ind + 1 if ind + 1 < capacity else 0
+
+        buckets[ind] = None
+        self._size -= 1
+        self._occupied -= 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Inserts or updates many key-value pairs.
+        Overrides the quadratic probe loop inlined by the base class.
+
+        Params: An iterable of (key, value) pairs.
+
+        Returns: None
+        """
+        pairs = list(pairs)
+        self._finish_resize()
+        self.reserve(self._size + len(pairs))
+
+        hash_function = self._hash_function
+        insert = self._insert
+        for key, value in pairs:
+            insert(key, value, hash_function(key))
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Looks up many keys at once.
+        Overrides the quadratic probe loop inlined by the base class.
+
+        Params: An iterable of keys.
+
+        Returns: A dynamic array with the value of each key, or None for keys not found.
+        """
+        self._finish_resize()
+
+        hash_function = self._hash_function
+        find_index = self._find_index
+        buckets = self._buckets.unchecked()
+        values = []
+        for key in keys:
+            ind = find_index(key, hash_function(key))
+            values.append(None if ind == -1 else buckets[ind].value)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes many keys at once; keys that are not found are ignored.
+
+        Params: An iterable of keys.
+
+        Returns: None
+        """
+        remove = self.remove
+        for key in keys:
+            remove(key)
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(25, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nprobe_stats example 1")
+    print("---------------------")
+    for load in (0.5, 0.7, 0.9):
+        m = HashMap(1009, hash_function_xxh32, max_load=0.95)
+        for i in range(int(load * m.get_capacity())):
+            m.put('key' + str(i), i)
+        mean, variance, maximum = m.probe_stats()
+        print(round(m.table_load(), 2), round(mean, 2), round(variance, 2), maximum)
+
+    print("\n__iter__(), __next__() example 2")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
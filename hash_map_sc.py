@@ -1,35 +1,230 @@
 
-from a6_include import (DynamicArray, LinkedList,
+import os
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from a6_include import (DynamicArray, GenerationArray, LinkedList, NodePool, SLNode, SortedChain,
+                        FIBONACCI_MULTIPLIER, fibonacci_index,
+                        next_ladder_prime, next_power_of_two,
                         hash_function_1, hash_function_2)
 
 
+class HashMapSnapshot:
+    """
+    Read-only view of a separate chaining HashMap as it was when its
+    snapshot() method was called. The map copies the table and any chain
+    before changing them, and builds new chains when resizing, so nothing
+    the view holds ever changes: it can be read from any thread without
+    locking while the map keeps taking writes.
+    """
+
+    def __init__(self, buckets, capacity: int, size: int, empty: int,
+                 function: callable, capacity_mode: str) -> None:
+        """
+        Initialize a view of a table that the map no longer changes
+        """
+        self._buckets = buckets
+        self._capacity = capacity
+        self._size = size
+        self._empty = empty
+        self._hash_function = function
+        self._pow2 = capacity_mode == 'pow2'
+
+    def get_size(self) -> int:
+        """
+        Return size of the map when the snapshot was taken
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of the map when the snapshot was taken
+        """
+        return self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Return the number of empty buckets when the snapshot was taken
+        """
+        return self._empty
+
+    def table_load(self) -> float:
+        """
+        Return the load factor when the snapshot was taken
+        """
+        return self._size / self._capacity
+
+    def _find(self, key: str) -> SLNode:
+        """
+        Return the node holding key, or None if the key is not in the snapshot
+        """
+        hash_code = self._hash_function(key)
+        if self._pow2:
+            bucket = self._buckets[fibonacci_index(hash_code, self._capacity)]
+        else:
+            bucket = self._buckets[hash_code % self._capacity]
+        return None if bucket is None else bucket.contains(key, hash_code)
+
+    def get(self, key: str):
+        """
+        Get the value the key had when the snapshot was taken.
+
+        Params: Key to search for.
+
+        Return: The value associated with the key, or None if the key is not found.
+        """
+        node = self._find(key)
+        return None if node is None else node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Check if the key was in the map when the snapshot was taken.
+
+        Params: Key to search for.
+
+        Return: True if the key is found, False otherwise.
+        """
+        return self._find(key) is not None
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Get a dynamic array of key-value pairs in the snapshot.
+
+        Params: None
+
+        Return: Dynamic array of key-value pairs.
+        """
+        return DynamicArray(list(self.items()))
+
+    def keys(self):
+        """
+        Yield the keys of the snapshot one at a time.
+
+        Params: None
+
+        Return: Generator of keys.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Yield the values of the snapshot one at a time.
+
+        Params: None
+
+        Return: Generator of values.
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self):
+        """
+        Yield the (key, value) pairs of the snapshot one at a time.
+
+        Params: None
+
+        Return: Generator of (key, value) tuples.
+        """
+        for bucket in self._buckets:
+            if bucket is not None:
+                for node in bucket:
+                    yield node.key, node.value
+
+    def __iter__(self):
+        """
+        Return a new iterator over the (key, value) pairs of the snapshot.
+
+        Params: None
+
+        Return: Generator of (key, value) tuples.
+        """
+        return self.items()
+
+
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental_step: int = 0,
+                 capacity_mode: str = 'prime',
+                 treeify_threshold: int = 8,
+                 self_organize: str = None,
+                 pool_size: int = 0,
+                 generations: bool = False,
+                 debug: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        With incremental_step > 0, growing the table moves that many old
+        buckets per operation instead of rehashing everything at once.
+        capacity_mode selects how capacities are picked: 'prime' (next prime
+        by trial division), 'ladder' (precomputed PRIME_LADDER) or 'pow2'
+        (powers of two, indexed with Fibonacci hashing).
+        A chain that reaches treeify_threshold nodes becomes a SortedChain
+        with binary search lookups, and turns back into a LinkedList once
+        it shrinks to treeify_threshold - 2 nodes. This bounds lookup cost
+        when many keys collide; 0 disables it. Chains whose colliding keys
+        cannot be ordered against each other stay LinkedLists.
+        self_organize='move_to_front' or 'transpose' moves a key found by
+        put, get or contains_key towards the head of its chain, so frequently
+        used keys are compared first under skewed access.
+        With pool_size > 0, removed nodes are kept in a NodePool of that
+        size and reused by later inserts instead of allocating new ones.
+        With generations=True the table is a GenerationArray, so clear()
+        takes O(1) time instead of rebuilding the table.
+        A histogram of chain lengths is kept up to date as keys come and go,
+        so empty_buckets() and chain_stats() do not scan the table;
+        debug=True cross-checks it against a full scan whenever it is read.
+        snapshot() hands out read-only views of the map; after one is taken,
+        writes copy the table and each chain they change instead of
+        modifying what the view holds.
         """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        if capacity_mode not in ('prime', 'ladder', 'pow2'):
+            raise ValueError(f"unknown capacity_mode: {capacity_mode!r}")
+        self._capacity_mode = capacity_mode
+
+        if self_organize not in (None, 'move_to_front', 'transpose'):
+            raise ValueError(f"unknown self_organize policy: {self_organize!r}")
+        self._reorder = self_organize
+
+        # capacity must be a prime number, or a power of two in 'pow2' mode;
+        # a bucket stays None until a key is inserted into it
+        self._capacity = self._select_capacity(capacity)
+        self._generations = generations
+        self._table_class = GenerationArray if generations else DynamicArray
+        self._buckets = self._table_class.filled(self._capacity)
+        # _chain_lengths[n] is the number of buckets of the current table
+        # holding n keys, so _chain_lengths[0] counts the empty ones
+        self._chain_lengths = [self._capacity]
+        self._debug = debug
 
         self._hash_function = function
         self._size = 0
+        self._treeify_threshold = treeify_threshold
+        self._pool = NodePool(SLNode, pool_size) if pool_size else None
+
+        # old table of an incremental resize; buckets below _migrate_index are moved
+        self._incremental_step = incremental_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # set while the current table may be shared with a live snapshot: the
+        # table array itself, and every chain whose byte in _cow is still 0
+        self._table_shared = False
+        self._cow = None
+        self._snapshots = None
 
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_resize()
         out = ''
-        for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        for i, bucket in enumerate(self._buckets):
+            out += str(i) + ': ' + str(bucket if bucket is not None else LinkedList()) + '\n'
         return out
 
     def _next_prime(self, capacity: int) -> int:
@@ -65,6 +260,57 @@ class HashMap:
 
         return True
 
+    def pool_stats(self) -> tuple:
+        """
+        Return the hits, misses and hit rate of the node pool, or None without one
+        """
+        if self._pool is None:
+            return None
+        return self._pool.stats()
+
+    def chain_stats(self) -> tuple:
+        """
+        Return the number of non-empty buckets, the mean and the longest chain length.
+        During an incremental resize these describe the new table only,
+        since keys still in the old table have no bucket in it yet.
+        """
+        if self._debug:
+            self.check_counters()
+
+        chain_lengths = self._chain_lengths
+        occupied = self._capacity - chain_lengths[0]
+        longest = len(chain_lengths) - 1
+        while longest and not chain_lengths[longest]:
+            longest -= 1
+        keys = sum(length * count for length, count in enumerate(chain_lengths))
+        return occupied, keys / occupied if occupied else 0.0, longest
+
+    def check_counters(self) -> None:
+        """
+        Compare the size and chain length counters against a full scan,
+        raising AssertionError on a mismatch
+        """
+        chain_lengths = [0] * len(self._chain_lengths)
+        size = 0
+        for bucket in self._buckets:
+            length = 0 if bucket is None else bucket.length()
+            while length >= len(chain_lengths):
+                chain_lengths.append(0)
+            chain_lengths[length] += 1
+            size += length
+
+        # keys still waiting in the old table of an incremental resize
+        if self._old_buckets is not None:
+            for bucket in self._old_buckets:
+                if bucket is not None:
+                    size += bucket.length()
+
+        if size != self._size:
+            raise AssertionError(f"size counter is {self._size}, but the table holds {size}")
+        if chain_lengths != self._chain_lengths:
+            raise AssertionError(f"chain length counters are {self._chain_lengths}, "
+                                 f"but the table holds {chain_lengths}")
+
     def get_size(self) -> int:
         """
         Return size of map
@@ -79,6 +325,140 @@ class HashMap:
         """
         return self._capacity
 
+    def _select_capacity(self, capacity: int) -> int:
+        """
+        Return the capacity to use for a requested capacity: a power of two
+        in 'pow2' mode, otherwise a prime (looked up in PRIME_LADDER in 'ladder' mode)
+        """
+        if self._capacity_mode == 'pow2':
+            return next_power_of_two(capacity)
+
+        if self._capacity_mode == 'ladder':
+            prime = next_ladder_prime(capacity)
+            if prime is not None:
+                return prime
+
+        if self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
+
+    def _index(self, hash_code: int, capacity: int) -> int:
+        """
+        Return the bucket index of a hash code in a table of the given capacity
+        """
+        if self._capacity_mode == 'pow2':
+            return fibonacci_index(hash_code, capacity)
+        return hash_code % capacity
+
+    def _insert_into(self, buckets: list, da_index: int,
+                     key: str, value: object, hash_code: int) -> None:
+        """
+        Insert a new key into a bucket, creating the bucket's LinkedList
+        on first use and converting it to a SortedChain if its chain
+        reaches the treeify threshold.
+
+        Params:
+            Table holding the bucket, as its unchecked list.
+            Index of the bucket.
+            Key to be inserted.
+            Value corresponding to the key.
+            Hash code of the key.
+
+        Return: None
+        """
+        bucket = buckets[da_index]
+        if bucket is None:
+            bucket = buckets[da_index] = LinkedList()
+        try:
+            bucket.insert(key, value, hash_code, self._pool)
+        except TypeError:
+            # the key does not order against the SortedChain's keys
+            bucket = buckets[da_index] = bucket.to_linked_list()
+            bucket.insert(key, value, hash_code, self._pool)
+        length = bucket.length()
+
+        chain_lengths = self._chain_lengths
+        chain_lengths[length - 1] -= 1
+        if length == len(chain_lengths):
+            chain_lengths.append(0)
+        chain_lengths[length] += 1
+
+        # only tried as the chain reaches the threshold, so a chain whose
+        # keys cannot be ordered is not sorted again on every insert
+        if length == self._treeify_threshold and type(bucket) is LinkedList:
+            try:
+                buckets[da_index] = SortedChain(bucket)
+            except TypeError:
+                pass
+
+    def _remove_from(self, buckets: list, da_index: int,
+                     key: str, hash_code: int, current: bool = True) -> bool:
+        """
+        Remove a key from a bucket, converting a SortedChain back to a
+        LinkedList once it is short enough, and dropping the bucket
+        once it is empty.
+
+        Params:
+            Table holding the bucket, as its unchecked list.
+            Index of the bucket.
+            Key to be removed.
+            Hash code of the key.
+            False if the bucket is in the old table, which has no chain length counters.
+
+        Return: True if the key was removed, False if it was not found.
+        """
+        bucket = buckets[da_index]
+        if bucket is None or not bucket.remove(key, hash_code, self._pool):
+            return False
+
+        length = bucket.length()
+        if current:
+            self._chain_lengths[length + 1] -= 1
+            self._chain_lengths[length] += 1
+
+        if length == 0:
+            buckets[da_index] = None
+        elif type(bucket) is SortedChain and length <= self._treeify_threshold - 2:
+            buckets[da_index] = bucket.to_linked_list()
+        return True
+
+    def _writable(self, da_index: int) -> list:
+        """
+        Make a bucket safe to change while a snapshot may share it, copying
+        the table array on the first write after the snapshot and the
+        bucket's chain on the first write to it.
+
+        Params: Index of the bucket.
+
+        Return: The current table, as its unchecked list.
+        """
+        if not self._snapshots:
+            # every snapshot has been dropped, so nothing is shared any more
+            self._table_shared = False
+            self._cow = None
+            self._snapshots = None
+            return self._buckets.unchecked()
+
+        if self._table_shared:
+            self._buckets = self._table_class(list(self._buckets))
+            self._table_shared = False
+
+        buckets = self._buckets.unchecked()
+        if not self._cow[da_index]:
+            if buckets[da_index] is not None:
+                buckets[da_index] = buckets[da_index].copy()
+            self._cow[da_index] = 1
+        return buckets
+
+    def _reorder_at(self, da_index: int) -> str:
+        """
+        Return the self-organizing policy for a bucket, or None while its
+        chain is shared with a snapshot, which must not see it reordered
+        """
+        if self._cow is None or not self._snapshots or self._cow[da_index]:
+            return self._reorder
+        return None
+
     # ------------------------------------------------------------------ #
 
     def put(self, key: str, value: object) -> None:
@@ -91,38 +471,82 @@ class HashMap:
 
         Return: None
         """
+        node = self._find_or_insert(key, value)
+        if node is not None:
+            node.value = value
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """
+        Add amount to the value of a key, inserting the key with value amount
+        if it is absent. Unlike a get followed by a put, the key is looked up once.
+
+        Params:
+            Key whose value is incremented.
+            Amount to add.
+
+        Return: The new value of the key.
+        """
+        node = self._find_or_insert(key, amount)
+        if node is None:
+            return amount
+        node.value += amount
+        return node.value
+
+    def _find_or_insert(self, key: str, value: object):
+        """
+        Look a key up for put() and increment(), growing the table first if
+        it is full. A key that is absent is inserted with the given value.
+
+        Params:
+            Key to look up.
+            Value to insert the key with if it is absent.
+
+        Return: The node holding the key, or None if the key was inserted.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
+
         if self.table_load() >= 1:
             new_cap = 2 * self._capacity
-            self.resize_table(new_cap)
+            if self._incremental_step:
+                self._start_resize(new_cap)
+            else:
+                self.resize_table(new_cap)
 
-            hash_code = self._hash_function(key)
-            da_index = hash_code % self._capacity
-        else:
-            hash_code = self._hash_function(key)
-            da_index = hash_code % self._capacity
+        hash_code = self._hash_function(key)
 
-        for l_list in range(self._capacity):
-            if self._buckets[l_list].contains(key) is not None:
-                self._buckets[l_list].contains(key).value = value
-                return
+        if self._old_buckets is not None:
+            node = self._find_old(key, hash_code)
+            if node is not None:
+                return node
+
+        da_index = self._index(hash_code, self._capacity)
+
+        buckets = self._buckets.unchecked() if self._cow is None else self._writable(da_index)
+        bucket = buckets[da_index]
+        if bucket is not None:
+            node = bucket.contains(key, hash_code, self._reorder)
+            if node is not None:
+                return node
 
+        self._insert_into(buckets, da_index, key, value, hash_code)
         self._size += 1
-        self._buckets[da_index].insert(key, value)
+        return None
 
     def empty_buckets(self) -> int:
         """
         Get the number of empty buckets in the hash map.
+        During an incremental resize this counts the new table only,
+        so polling it does not force the migration to finish.
 
         Params: None
 
         Return: Number of empty buckets.
         """
-        num_empty_buckets = 0
-        for bucket_index in range(self._capacity):
-            if self._buckets[bucket_index].length() == 0:
-                num_empty_buckets += 1
+        if self._debug:
+            self.check_counters()
 
-        return num_empty_buckets
+        return self._chain_lengths[0]
 
     def table_load(self) -> float:
         """
@@ -142,45 +566,141 @@ class HashMap:
 
         Return: None
         """
-        self._buckets = DynamicArray()
-
-        for l_list in range(self._capacity):
-            self._buckets.append(LinkedList())
-            self._size = 0
+        self._old_buckets = None
+        if self._generations and not self._table_shared:
+            self._buckets.clear()
+        else:
+            self._buckets = self._table_class.filled(self._capacity)
+        self._chain_lengths = [self._capacity]
+        self._size = 0
+        self._table_shared = False
+        self._cow = None
+        self._snapshots = None
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Resize the hash table to a new capacity.
+        Nodes keep their cached hash, so the hash function is not called again.
 
         Params: New capacity for the hash table.
 
         Return: None
         """
-
-        old_cap = self._capacity
+        self._finish_resize()
 
         temp = self._buckets
 
         if new_capacity < 1:
             return
 
-        if self._is_prime(new_capacity) is False:
-            self._capacity = self._next_prime(new_capacity)
-        else:
-            self._capacity = new_capacity
+        new_capacity = self._select_capacity(new_capacity)
 
-        self._buckets = DynamicArray()
+        # grow the same way re-inserting every key through put() would
+        while self._size and (self._size - 1) / new_capacity >= 1:
+            new_capacity = self._select_capacity(2 * new_capacity)
 
-        for bucket in range(self._capacity):
-            self._buckets.append(LinkedList())
+        self._capacity = new_capacity
 
-        self._size = 0
+        self._buckets = self._table_class.filled(self._capacity)
+        self._chain_lengths = [self._capacity]
+        buckets = self._buckets.unchecked()
 
-        for l_list in range(old_cap):
-            it = temp[l_list].__iter__()
+        # the new chains are built from new nodes, so nothing is shared any more
+        self._table_shared = False
+        self._cow = None
+        self._snapshots = None
 
-            for elem in it:
-                self.put(elem.key, elem.value)
+        # keys are already unique, so nodes go straight into their new chain
+        for l_list in temp:
+            if l_list is None:
+                continue
+            for elem in l_list:
+                da_index = self._index(elem.hash_code, self._capacity)
+                self._insert_into(buckets, da_index, elem.key, elem.value, elem.hash_code)
+
+    def _start_resize(self, new_capacity: int) -> None:
+        """
+        Begin an incremental resize: the current table becomes the old table
+        and its buckets are moved over by later operations.
+
+        Params: New capacity for the hash table.
+
+        Return: None
+        """
+        self._finish_resize()
+
+        # migrating would empty buckets of a table a snapshot may share
+        if self._cow is not None:
+            if self._snapshots:
+                self.resize_table(new_capacity)
+                return
+            self._table_shared = False
+            self._cow = None
+            self._snapshots = None
+
+        new_capacity = self._select_capacity(new_capacity)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+
+        self._capacity = new_capacity
+        self._buckets = self._table_class.filled(new_capacity)
+        self._chain_lengths = [new_capacity]
+
+    def _migrate(self, steps: int) -> None:
+        """
+        Move the next old buckets of an incremental resize into the new table.
+
+        Params: Number of old buckets to move.
+
+        Return: None
+        """
+        old_buckets = self._old_buckets.unchecked()
+        buckets = self._buckets.unchecked()
+        end = min(self._migrate_index + steps, self._old_capacity)
+
+        for old_index in range(self._migrate_index, end):
+            if old_buckets[old_index] is None:
+                continue
+            for elem in old_buckets[old_index]:
+                da_index = self._index(elem.hash_code, self._capacity)
+                self._insert_into(buckets, da_index, elem.key, elem.value, elem.hash_code)
+            old_buckets[old_index] = None
+
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_resize(self) -> None:
+        """
+        Complete any incremental resize still in progress.
+
+        Params: None
+
+        Return: None
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def _find_old(self, key: str, hash_code: int):
+        """
+        Look a key up in the old table of an incremental resize.
+
+        Params:
+            Key to search for.
+            Hash code of the key.
+
+        Return: The matching node, or None if the key is not in a bucket still waiting to move.
+        """
+        old_index = self._index(hash_code, self._old_capacity)
+        if old_index < self._migrate_index:
+            return None
+
+        bucket = self._old_buckets.unchecked()[old_index]
+        if bucket is None:
+            return None
+        return bucket.contains(key, hash_code)
 
     def get(self, key: str):
         """
@@ -190,11 +710,18 @@ class HashMap:
 
         Return: The value associated with the key, or None if the key is not found.
         """
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
+
         hash_code = self._hash_function(key)
 
-        da_index = hash_code % self._capacity
+        da_index = self._index(hash_code, self._capacity)
 
-        node = self._buckets[da_index].contains(key)
+        reorder = self._reorder if self._cow is None else self._reorder_at(da_index)
+        bucket = self._buckets.unchecked()[da_index]
+        node = None if bucket is None else bucket.contains(key, hash_code, reorder)
+        if node is None and self._old_buckets is not None:
+            node = self._find_old(key, hash_code)
 
         if node is None:
             return
@@ -209,11 +736,18 @@ class HashMap:
 
         Return: True if the key is found, False otherwise.
         """
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
+
         hash_code = self._hash_function(key)
 
-        da_index = hash_code % self._capacity
+        da_index = self._index(hash_code, self._capacity)
 
-        node = self._buckets[da_index].contains(key)
+        reorder = self._reorder if self._cow is None else self._reorder_at(da_index)
+        bucket = self._buckets.unchecked()[da_index]
+        node = None if bucket is None else bucket.contains(key, hash_code, reorder)
+        if node is None and self._old_buckets is not None:
+            node = self._find_old(key, hash_code)
 
         if node:
             return True
@@ -228,18 +762,21 @@ class HashMap:
 
         Return: None
         """
-        hash_code = self._hash_function(key)
+        if self._old_buckets is not None:
+            self._migrate(self._incremental_step)
 
-        da_index = hash_code % self._capacity
+        hash_code = self._hash_function(key)
 
-        node = self._buckets[da_index].contains(key)
+        da_index = self._index(hash_code, self._capacity)
 
-        if node:
-            if node.key == key:
-                self._buckets[da_index].remove(key)
+        buckets = self._buckets.unchecked() if self._cow is None else self._writable(da_index)
+        if self._remove_from(buckets, da_index, key, hash_code):
+            self._size -= 1
+        elif self._old_buckets is not None:
+            old_index = self._index(hash_code, self._old_capacity)
+            if old_index >= self._migrate_index and \
+                    self._remove_from(self._old_buckets.unchecked(), old_index, key, hash_code, False):
                 self._size -= 1
-        else:
-            return
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -249,15 +786,242 @@ class HashMap:
 
         Return: Dynamic array containing key-value pairs.
         """
+        self._finish_resize()
         ret_da = DynamicArray()
 
-        for linked_list in range(self._capacity):
-            iterator = self._buckets[linked_list].__iter__()
-            for elem in iterator:
+        for linked_list in self._buckets:
+            if linked_list is None:
+                continue
+            for elem in linked_list:
                 ret_da.append((elem.key, elem.value))
 
         return ret_da
 
+    def keys(self):
+        """
+        Yield the keys one at a time without copying the table.
+
+        Params: None
+
+        Return: Generator of keys.
+        """
+        for node in self:
+            yield node.key
+
+    def values(self):
+        """
+        Yield the values one at a time without copying the table.
+
+        Params: None
+
+        Return: Generator of values.
+        """
+        for node in self:
+            yield node.value
+
+    def items(self):
+        """
+        Yield the key-value pairs one at a time without copying the table.
+
+        Params: None
+
+        Return: Generator of (key, value) tuples.
+        """
+        for node in self:
+            yield node.key, node.value
+
+    def __iter__(self):
+        """
+        Return a new iterator over the nodes of every chain.
+        Each iterator keeps its own position, so loops can be nested.
+
+        Params: None
+
+        Return: Generator of SLNode objects.
+        """
+        self._finish_resize()
+        for bucket in self._buckets:
+            if bucket is not None:
+                yield from bucket
+
+    def snapshot(self) -> HashMapSnapshot:
+        """
+        Take a read-only view of the map as it is now, without copying any
+        chain once any incremental resize has finished. The view shares the
+        table with the map; later writes copy the table and the chains they
+        change first, so views of older versions share every untouched chain.
+        Copy-on-write ends at the first write after every view is dropped.
+
+        Params: None
+
+        Return: A HashMapSnapshot of the current keys and values.
+        """
+        self._finish_resize()
+        self._table_shared = True
+        self._cow = bytearray(self._capacity)
+        if self._snapshots is None:
+            self._snapshots = weakref.WeakSet()
+        view = HashMapSnapshot(self._buckets.unchecked(), self._capacity, self._size,
+                               self._chain_lengths[0], self._hash_function, self._capacity_mode)
+        self._snapshots.add(view)
+        return view
+
+    def reserve(self, count: int) -> None:
+        """
+        Grow the table once, if needed, so that count entries fit
+        under the load factor without any further resizes.
+
+        Params: Number of entries the table must hold.
+
+        Return: None
+        """
+        if count and (count - 1) / self._capacity >= 1:
+            self.resize_table(count)
+
+    @classmethod
+    def from_items(cls, items, function: callable = hash_function_1, **kwargs) -> "HashMap":
+        """
+        Build a map from key-value pairs in a single pass,
+        allocating a table large enough that no resize is needed.
+
+        Params:
+            Iterable of (key, value) pairs.
+            Hash function for the map.
+            Any other HashMap constructor arguments.
+
+        Return: The new HashMap.
+        """
+        items = list(items)
+        h_map = cls(max(len(items), 1), function, **kwargs)
+        h_map.put_many(items)
+        return h_map
+
+    def put_many(self, pairs) -> None:
+        """
+        Insert or update many key-value pairs.
+        The table is sized once for the case where every key is new,
+        then the pairs are inserted without per-call load checks.
+        Bucket indexing and chain walks are inlined for the current
+        capacity mode instead of going through _index() and contains().
+
+        Params: Iterable of (key, value) pairs.
+
+        Return: None
+        """
+        pairs = list(pairs)
+        self._finish_resize()
+        self.reserve(self._size + len(pairs))
+
+        hash_function = self._hash_function
+        insert_into = self._insert_into
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        reorder = self._reorder
+        added = 0
+        # keys inserted before a hash function raises still count towards the size
+        try:
+            for key, value in pairs:
+                hash_code = hash_function(key)
+                if pow2:
+                    da_index = ((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+                else:
+                    da_index = hash_code % capacity
+                if self._cow is not None:
+                    buckets = self._writable(da_index)
+
+                bucket = buckets[da_index]
+                if bucket is None:
+                    node = None
+                elif reorder is None and type(bucket) is LinkedList:
+                    node = bucket._head
+                    while node is not None and (node.hash_code != hash_code or node.key != key):
+                        node = node.next
+                else:
+                    node = bucket.contains(key, hash_code, reorder)
+
+                if node is None:
+                    insert_into(buckets, da_index, key, value, hash_code)
+                    added += 1
+                else:
+                    node.value = value
+        finally:
+            self._size += added
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Look up many keys at once, with bucket indexing and chain walks
+        inlined as in put_many().
+
+        Params: Iterable of keys.
+
+        Return: Dynamic array with the value of each key, or None for keys not found.
+        """
+        self._finish_resize()
+
+        hash_function = self._hash_function
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        # chains shared with a snapshot must not be reordered
+        reorder = self._reorder if self._cow is None or not self._snapshots else None
+        values = []
+        append = values.append
+        for key in keys:
+            hash_code = hash_function(key)
+            if pow2:
+                bucket = buckets[((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift]
+            else:
+                bucket = buckets[hash_code % capacity]
+
+            if bucket is None:
+                append(None)
+                continue
+            if reorder is None and type(bucket) is LinkedList:
+                node = bucket._head
+                while node is not None and (node.hash_code != hash_code or node.key != key):
+                    node = node.next
+            else:
+                node = bucket.contains(key, hash_code, reorder)
+            append(None if node is None else node.value)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        Remove many keys at once; keys that are not found are ignored.
+
+        Params: Iterable of keys.
+
+        Return: None
+        """
+        self._finish_resize()
+
+        hash_function = self._hash_function
+        remove_from = self._remove_from
+        buckets = self._buckets.unchecked()
+        capacity = self._capacity
+        pow2 = self._capacity_mode == 'pow2'
+        shift = 65 - capacity.bit_length()
+        removed = 0
+        try:
+            for key in keys:
+                hash_code = hash_function(key)
+                if pow2:
+                    da_index = ((hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+                else:
+                    da_index = hash_code % capacity
+                if self._cow is not None:
+                    buckets = self._writable(da_index)
+                elif buckets[da_index] is None:
+                    continue
+                if remove_from(buckets, da_index, key, hash_code):
+                    removed += 1
+        finally:
+            self._size -= removed
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -296,6 +1060,206 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     return mode_da, freq
 
 
+class ModeCounter:
+    """
+    Counts values from a stream in a single pass, keeping the highest
+    frequency and the values that reach it up to date as values arrive,
+    so no final scan over the counts is needed.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1) -> None:
+        """
+        Initialize an empty counter.
+
+        Params:
+            Initial capacity of the map holding the counts.
+            Hash function for the values.
+
+        Return: None
+        """
+        self._counts = HashMap(capacity, function)
+        self._freq = 0
+        self._modes = DynamicArray()
+
+    def add(self, value: str) -> None:
+        """
+        Count one occurrence of a value.
+
+        Params: Value to count.
+
+        Return: None
+        """
+        count = self._counts.increment(value)
+        if count > self._freq:
+            self._freq = count
+            self._modes = DynamicArray([value])
+        elif count == self._freq:
+            self._modes.append(value)
+
+    def update(self, values) -> None:
+        """
+        Count every value of an iterable, e.g. one chunk of a larger source.
+
+        Params: Iterable of values.
+
+        Return: None
+        """
+        increment = self._counts.increment
+        freq = self._freq
+        modes = self._modes
+        for value in values:
+            count = increment(value)
+            if count > freq:
+                freq = count
+                modes = DynamicArray([value])
+            elif count == freq:
+                modes.append(value)
+
+        self._freq = freq
+        self._modes = modes
+
+    def result(self) -> (DynamicArray, int):
+        """
+        Get the modes counted so far, in the order they reached the highest frequency.
+
+        Params: None
+
+        Return: A tuple containing a dynamic array of mode or modes and the frequency.
+        """
+        return DynamicArray(self._modes.unchecked()), self._freq
+
+
+def stream_mode(source, chunked: bool = False, function: callable = hash_function_1) -> (DynamicArray, int):
+    """
+    Find the mode or modes and frequency of any iterable in one pass,
+    without materializing it.
+
+    Params:
+        Iterable of values, or of chunks of values if chunked is True.
+        Hash function for the values.
+
+    Return: A tuple containing a dynamic array of mode or modes and the frequency.
+    """
+    counter = ModeCounter(function=function)
+    if chunked:
+        for chunk in source:
+            counter.update(chunk)
+    else:
+        counter.update(source)
+    return counter.result()
+
+
+def _count_chunk(chunk: list, partitions: int, function: callable) -> list:
+    """
+    Map step of parallel_mode: count one chunk and split the counts by
+    partition, using the hash code cached in each node.
+
+    Params:
+        List of values.
+        Number of partitions.
+        Hash function for the values.
+
+    Return: A list holding a list of (value, count) pairs for each partition.
+    """
+    counts = HashMap(len(chunk), function)
+    increment = counts.increment
+    for value in chunk:
+        increment(value)
+
+    parts = [[] for _ in range(partitions)]
+    for node in counts:
+        parts[node.hash_code % partitions].append((node.key, node.value))
+    return parts
+
+
+def _merge_partition(parts: list, function: callable) -> (list, int):
+    """
+    Reduce step of parallel_mode: add up the counts of one partition.
+    Every occurrence of a value lands in the same partition, so the
+    partition's modes are final for the values it holds.
+
+    Params:
+        List of (value, count) pair lists from the map step.
+        Hash function for the values.
+
+    Return: A tuple containing a list of the partition's modes and their frequency.
+    """
+    counts = HashMap(sum(len(pairs) for pairs in parts) or 1, function)
+    increment = counts.increment
+    freq = 0
+    modes = []
+    for pairs in parts:
+        for value, count in pairs:
+            total = increment(value, count)
+            if total > freq:
+                freq = total
+                modes = [value]
+            elif total == freq:
+                modes.append(value)
+
+    return modes, freq
+
+
+def parallel_mode(source, workers: int = None, chunk_size: int = 262144,
+                  function: callable = hash_function_1) -> (DynamicArray, int):
+    """
+    Find the mode or modes and frequency of a dynamic array or any iterable
+    with a process pool. Chunks of the input are counted in parallel, the
+    partial counts are shuffled into one partition per worker by hash code,
+    and the partitions are merged in parallel too. At most two chunks per
+    worker are in flight, so the input is never materialized as a whole.
+    The hash function must give the same codes in every process, which
+    hash_function_1 does and the builtin hash of a str does not, and must
+    be picklable: a module-level function or make_seeded_hash_function(),
+    not a lambda or a closure.
+
+    Params:
+        Dynamic array or iterable of values.
+        Number of worker processes, the CPU count by default.
+        Number of values per chunk.
+        Hash function for the values.
+
+    Return: A tuple containing a dynamic array of mode or modes and the frequency,
+            the same as find_mode though the modes may come in another order.
+    """
+    if isinstance(source, DynamicArray):
+        source = source.unchecked()
+    values = iter(source)
+    partitions = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(partitions) as executor:
+        shuffled = [[] for _ in range(partitions)]
+
+        def collect(done):
+            for future in done:
+                for partition, pairs in enumerate(future.result()):
+                    if pairs:
+                        shuffled[partition].append(pairs)
+
+        pending = set()
+        chunk = list(islice(values, chunk_size))
+        while chunk:
+            if len(pending) >= 2 * partitions:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_count_chunk, chunk, partitions, function))
+            chunk = list(islice(values, chunk_size))
+        collect(wait(pending)[0])
+
+        freq = 0
+        modes = DynamicArray()
+        for part_modes, part_freq in executor.map(_merge_partition, shuffled,
+                                                  [function] * partitions):
+            if part_freq > freq:
+                freq = part_freq
+                modes = DynamicArray(part_modes)
+            elif part_freq == freq:
+                for value in part_modes:
+                    modes.append(value)
+
+    return modes, freq
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -0,0 +1,478 @@
+# Description: asyncio key-value server and client over TCP or Unix sockets, storing the data in one
+# of the HashMap implementations, with a loopback load generator
+#
+# Usage: python hash_map_server.py serve [--map sc] [--host 127.0.0.1] [--port 7878] [--unix PATH]
+#        python hash_map_server.py load [--host 127.0.0.1] [--port 7878] [--unix PATH] [options]
+#        python hash_map_server.py bench [--map sc] [options]   (server and load generator in one process)
+#
+# Protocol: every request is a header struct.pack('!BHI', op, key length, value length) followed by
+# the UTF-8 key and the value bytes; every response is struct.pack('!BI', status, value length)
+# followed by the value bytes. Responses come back in request order, so a client may send any
+# number of requests before reading (pipelining).
+
+import argparse
+import asyncio
+import collections
+import random
+import struct
+import time
+
+import hash_map_oa
+import hash_map_rh
+import hash_map_sc
+import hash_map_soa
+import hash_map_swiss
+from a6_include import hash_function_builtin
+
+OP_GET = 1
+OP_PUT = 2
+OP_REMOVE = 3
+OP_CONTAINS = 4
+
+STATUS_OK = 0
+STATUS_MISSING = 1
+STATUS_ERROR = 2
+
+REQUEST_HEADER = struct.Struct('!BHI')
+RESPONSE_HEADER = struct.Struct('!BI')
+
+MAP_CLASSES = {
+    'sc': hash_map_sc.HashMap,
+    'oa': hash_map_oa.HashMap,
+    'rh': hash_map_rh.HashMap,
+    'soa': hash_map_soa.HashMap,
+    'swiss': hash_map_swiss.HashMap,
+}
+
+
+class ProtocolError(Exception):
+    """
+    Raised by the client when the server answers a request with STATUS_ERROR
+    """
+    pass
+
+
+def encode_request(op: int, key: str, value: bytes = b'') -> bytes:
+    """
+    Return the wire form of a request
+    """
+    key = key.encode()
+    return REQUEST_HEADER.pack(op, len(key), len(value)) + key + value
+
+
+class KeyValueServer:
+    """
+    Serves get/put/remove/contains_key on a HashMap to any number of
+    connections. Everything runs on one event loop thread, so the map needs
+    no locking. Each read from a connection is parsed into every complete
+    request it holds, and the batch is executed in one go: runs of gets and
+    puts go through get_many and put_many when the map has them, and all
+    responses are written back with a single write.
+    """
+
+    def __init__(self, h_map) -> None:
+        """
+        Initialize a server around a map; keys are str and values bytes.
+        """
+        self._map = h_map
+        self._get_many = getattr(h_map, 'get_many', None)
+        self._put_many = getattr(h_map, 'put_many', None)
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 7878, path: str = None):
+        """
+        Start listening on a TCP port, or on a Unix socket if path is given.
+        Return the asyncio server; with port 0 its sockets tell the port picked.
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve_connection, path)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """
+        Stop listening and wait for the server to close.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Read requests from one connection until it closes, answering each
+        batch that arrives together with one write.
+        """
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                buffer += data
+
+                requests, consumed = self._parse(buffer)
+                del buffer[:consumed]
+                if requests:
+                    writer.write(self._execute(requests))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse(buffer: bytearray) -> (list, int):
+        """
+        Split the complete requests off the front of a buffer.
+        Return a list of (op, key, value) tuples and the number of bytes they took.
+        A key that is not valid UTF-8 is returned as None, so the request
+        can be answered with an error without losing the framing.
+        """
+        requests = []
+        view = memoryview(buffer)
+        pos = 0
+        header_size = REQUEST_HEADER.size
+        while len(buffer) - pos >= header_size:
+            op, key_length, value_length = REQUEST_HEADER.unpack_from(buffer, pos)
+            end = pos + header_size + key_length + value_length
+            if end > len(buffer):
+                break
+
+            key_end = pos + header_size + key_length
+            try:
+                key = str(view[pos + header_size:key_end], 'utf-8')
+            except UnicodeDecodeError:
+                key = None
+            requests.append((op, key, bytes(view[key_end:end])))
+            pos = end
+
+        view.release()
+        return requests, pos
+
+    def _execute(self, requests: list) -> bytes:
+        """
+        Run a batch of requests against the map in order and return their responses.
+        """
+        out = []
+        i = 0
+        while i < len(requests):
+            op = requests[i][0]
+
+            # gather a run of the same bulk-capable operation on valid keys
+            j = i + 1
+            if requests[i][1] is not None and \
+                    ((op == OP_GET and self._get_many is not None) or
+                     (op == OP_PUT and self._put_many is not None)):
+                while j < len(requests) and requests[j][0] == op and requests[j][1] is not None:
+                    j += 1
+
+            if j - i > 1:
+                try:
+                    out.append(self._execute_run(op, requests[i:j]))
+                    i = j
+                    continue
+                except Exception:
+                    # gets and puts can be repeated safely, so answer the run
+                    # one request at a time and fail only the requests that fail
+                    pass
+
+            for request in requests[i:j]:
+                out.append(self._execute_one(*request))
+            i = j
+
+        return b''.join(out)
+
+    def _execute_run(self, op: int, requests: list) -> bytes:
+        """
+        Run a run of gets or puts with one get_many or put_many call and return their responses.
+        """
+        if op == OP_GET:
+            return b''.join(self._response(STATUS_MISSING, b'') if value is None
+                            else self._response(STATUS_OK, value)
+                            for value in self._get_many([key for _, key, _ in requests]))
+
+        self._put_many([(key, value) for _, key, value in requests])
+        return self._response(STATUS_OK, b'') * len(requests)
+
+    def _execute_one(self, op: int, key: str, value: bytes) -> bytes:
+        """
+        Run one request against the map and return its response. A request
+        with an unknown op or a key that is not valid UTF-8, or one the map
+        raises on, is answered with STATUS_ERROR.
+        """
+        if key is None:
+            return self._response(STATUS_ERROR, b'')
+
+        h_map = self._map
+        try:
+            if op == OP_GET:
+                value = h_map.get(key)
+                return self._response(STATUS_MISSING, b'') if value is None \
+                    else self._response(STATUS_OK, value)
+            if op == OP_PUT:
+                h_map.put(key, value)
+                return self._response(STATUS_OK, b'')
+            if op == OP_REMOVE:
+                h_map.remove(key)
+                return self._response(STATUS_OK, b'')
+            if op == OP_CONTAINS:
+                return self._response(STATUS_OK if h_map.contains_key(key) else STATUS_MISSING, b'')
+        except Exception:
+            pass
+        return self._response(STATUS_ERROR, b'')
+
+    @staticmethod
+    def _response(status: int, value: bytes) -> bytes:
+        """
+        Return the wire form of a response
+        """
+        return RESPONSE_HEADER.pack(status, len(value)) + value
+
+
+class KeyValueClient:
+    """
+    Client for KeyValueServer. Requests made during one event loop tick are
+    sent together with a single write once the tick ends, and answered in
+    order by a background task, so many requests can be in flight on one
+    connection, e.g. with asyncio.gather.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Initialize a client on an open connection; use connect() instead.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._pending = collections.deque()
+        self._outgoing = []
+        self._loop = asyncio.get_running_loop()
+        self._receiver = self._loop.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 7878,
+                      path: str = None) -> "KeyValueClient":
+        """
+        Open a connection to a server on a TCP port, or on a Unix socket if path is given.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        """
+        Close the connection once every pending request has been answered.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        self._receiver.cancel()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    def _request(self, op: int, key: str, value: bytes = b'') -> asyncio.Future:
+        """
+        Send a request and return a future for its (status, value) response.
+        """
+        # encode first, so a key or value that cannot be sent leaves no
+        # future behind to take another request's response
+        request = encode_request(op, key, value)
+        future = self._loop.create_future()
+        self._pending.append(future)
+        if not self._outgoing:
+            self._loop.call_soon(self._flush)
+        self._outgoing.append(request)
+        return future
+
+    def _flush(self) -> None:
+        """
+        Send every request made since the last flush with one write.
+        """
+        self._writer.write(b''.join(self._outgoing))
+        self._outgoing.clear()
+
+    async def _receive(self) -> None:
+        """
+        Read responses and resolve the pending futures in request order.
+        """
+        header_size = RESPONSE_HEADER.size
+        try:
+            while True:
+                status, length = RESPONSE_HEADER.unpack(await self._reader.readexactly(header_size))
+                value = await self._reader.readexactly(length) if length else b''
+                future = self._pending.popleft()
+                if not future.cancelled():
+                    future.set_result((status, value))
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection lost: {error}"))
+
+    async def _call(self, op: int, key: str, value: bytes = b'') -> (int, bytes):
+        """
+        Send a request and wait for its response, raising ProtocolError on STATUS_ERROR.
+        """
+        status, value = await self._request(op, key, value)
+        if status == STATUS_ERROR:
+            raise ProtocolError(f"server rejected operation {op}")
+        return status, value
+
+    async def get(self, key: str) -> bytes:
+        """
+        Return the value of a key, or None if the key is not found.
+        """
+        status, value = await self._call(OP_GET, key)
+        return value if status == STATUS_OK else None
+
+    async def put(self, key: str, value: bytes) -> None:
+        """
+        Insert or update a key-value pair.
+        """
+        await self._call(OP_PUT, key, value)
+
+    async def remove(self, key: str) -> None:
+        """
+        Remove a key if it is present.
+        """
+        await self._call(OP_REMOVE, key)
+
+    async def contains_key(self, key: str) -> bool:
+        """
+        Return True if the key is present.
+        """
+        status, _ = await self._call(OP_CONTAINS, key)
+        return status == STATUS_OK
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """
+    Return the value at a fraction of a sorted list, by the nearest rank
+    """
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def run_load(host: str = '127.0.0.1', port: int = 7878, path: str = None,
+                   connections: int = 4, depth: int = 32, requests: int = 100_000,
+                   keyspace: int = 10_000, get_ratio: float = 0.8, value_size: int = 32,
+                   seed: int = 0) -> dict:
+    """
+    Drive a server from several connections, each keeping up to depth
+    requests in flight, with a mix of gets and puts over a fixed keyspace.
+    Return a dict with the number of operations, the elapsed time, ops/sec
+    and the p50/p90/p99/p999 latencies in microseconds.
+    """
+    clients = [await KeyValueClient.connect(host, port, path) for _ in range(connections)]
+    value = b'x' * value_size
+    keys = ['key' + str(i) for i in range(keyspace)]
+    latencies = []
+    per_connection = requests // connections
+
+    # warm up: make the gets hit
+    await asyncio.gather(*(clients[0].put(key, value) for key in keys))
+
+    async def drive(client: KeyValueClient, rnd: random.Random) -> None:
+        window = asyncio.Semaphore(depth)
+
+        async def one(key: str, is_get: bool) -> None:
+            start = time.perf_counter()
+            if is_get:
+                await client.get(key)
+            else:
+                await client.put(key, value)
+            latencies.append(time.perf_counter() - start)
+            window.release()
+
+        tasks = []
+        for _ in range(per_connection):
+            await window.acquire()
+            tasks.append(asyncio.ensure_future(one(rnd.choice(keys), rnd.random() < get_ratio)))
+        await asyncio.gather(*tasks)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(client, random.Random(seed + i)) for i, client in enumerate(clients)))
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    return {
+        'ops': len(latencies),
+        'seconds': elapsed,
+        'ops_per_sec': len(latencies) / elapsed,
+        'p50_us': percentile(latencies, 0.5) * 1e6,
+        'p90_us': percentile(latencies, 0.9) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+        'p999_us': percentile(latencies, 0.999) * 1e6,
+    }
+
+
+def format_report(report: dict) -> str:
+    """
+    Return a one-line summary of a run_load report
+    """
+    return (f"{report['ops']} ops in {report['seconds']:.2f} s: {report['ops_per_sec']:,.0f} ops/s, "
+            f"p50 {report['p50_us']:.0f} us, p90 {report['p90_us']:.0f} us, "
+            f"p99 {report['p99_us']:.0f} us, p99.9 {report['p999_us']:.0f} us")
+
+
+async def run_loopback(map_name: str = 'sc', path: str = None, **load_options) -> dict:
+    """
+    Start a server with a new map on a free loopback port (or a Unix socket),
+    run the load generator against it and return its report.
+    """
+    server = KeyValueServer(MAP_CLASSES[map_name](11, hash_function_builtin))
+    listener = await server.start(port=0, path=path)
+    port = None if path is not None else listener.sockets[0].getsockname()[1]
+    try:
+        return await run_load(port=port, path=path, **load_options)
+    finally:
+        await server.close()
+
+
+async def _serve_forever(map_name: str, host: str, port: int, path: str) -> None:
+    """
+    Run a server with a new map until the process is interrupted.
+    """
+    server = KeyValueServer(MAP_CLASSES[map_name](11, hash_function_builtin))
+    listener = await server.start(host, port, path)
+    print(f"serving a {map_name} map on {path or f'{host}:{port}'}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main() -> None:
+    """
+    Run the serve, load or bench command given on the command line
+    """
+    parser = argparse.ArgumentParser(description="Key-value server on top of a HashMap")
+    parser.add_argument('command', choices=('serve', 'load', 'bench'))
+    parser.add_argument('--map', choices=sorted(MAP_CLASSES), default='sc')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878)
+    parser.add_argument('--unix', default=None, help="Unix socket path instead of TCP")
+    parser.add_argument('--connections', type=int, default=4)
+    parser.add_argument('--depth', type=int, default=32, help="requests in flight per connection")
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--keyspace', type=int, default=10_000)
+    parser.add_argument('--get-ratio', type=float, default=0.8)
+    parser.add_argument('--value-size', type=int, default=32)
+    args = parser.parse_args()
+
+    load_options = dict(connections=args.connections, depth=args.depth, requests=args.requests,
+                        keyspace=args.keyspace, get_ratio=args.get_ratio, value_size=args.value_size)
+    if args.command == 'serve':
+        try:
+            asyncio.run(_serve_forever(args.map, args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == 'load':
+        print(format_report(asyncio.run(run_load(args.host, args.port, args.unix, **load_options))))
+    else:
+        print(format_report(asyncio.run(run_loopback(args.map, args.unix, **load_options))))
+
+
+if __name__ == "__main__":
+    main()
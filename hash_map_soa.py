@@ -0,0 +1,445 @@
+# Description: HashMap implementation with Open Addressing and quadratic probing,
+# storing the table as parallel flat arrays (struct of arrays) instead of HashEntry objects
+
+from array import array
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+
+# per-slot states kept in the state byte array
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# hash codes are stored as unsigned 64-bit integers in a flat array
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, compact_threshold: float = 0.75) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution and keeps keys, values, hashes and slot states in
+        parallel arrays.
+        The table is rehashed at the same capacity once live entries
+        plus tombstones reach compact_threshold of the capacity.
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('Q', bytes(8 * self._capacity))
+        self._states = bytearray(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._compact_threshold = compact_threshold
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                entry = None
+            else:
+                entry = self._entry(i)
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of tombstones in the table
+        """
+        return self._tombstones
+
+    # ------------------------------------------------------------------ #
+
+    def _entry(self, index: int) -> HashEntry:
+        """
+        Builds a HashEntry view of the slot at the given index.
+
+        Params: Index of a non-empty slot.
+
+        Returns: A new HashEntry holding the slot's key and value.
+        """
+        entry = HashEntry(self._keys[index], self._values[index])
+        entry.is_tombstone = self._states[index] == _TOMBSTONE
+        return entry
+
+    def _find_index(self, key: str, hash_code: int) -> int:
+        """
+        Follows the quadratic probe sequence of the key, skipping tombstones.
+
+        Params:
+            - The key to search for.
+            - The key's hash code.
+
+        Returns: Index of the live slot holding the key, or -1 if the key is not found.
+        """
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        initial_index = hash_code % capacity
+
+        j = 0
+        ind = initial_index
+        while j < capacity:
+            state = states[ind]
+            if state == _EMPTY:
+                return -1
+            if state == _LIVE and hashes[ind] == hash_code and keys[ind] == key:
+                return ind
+
+            j += 1
+            ind = (initial_index + j * j) % capacity
+
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Inserts a key-value pair into the hash map.
+
+        Params:
+            - The key to be inserted.
+            - The value associated with the key.
+
+        Returns: None
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(2 * self._capacity)
+        elif self._tombstones and \
+                (self._size + self._tombstones) / self._capacity >= self._compact_threshold:
+            self.compact()
+
+        hash_code = self._hash_function(key) & _HASH_MASK
+        capacity = self._capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        initial_index = hash_code % capacity
+
+        first_tombstone = -1
+        j = 0
+        ind = initial_index
+        while j < capacity:
+            state = states[ind]
+            if state == _EMPTY:
+                break
+            if state == _TOMBSTONE:
+                if first_tombstone == -1:
+                    first_tombstone = ind
+            elif hashes[ind] == hash_code and keys[ind] == key:
+                self._values[ind] = value
+                return
+
+            j += 1
+            ind = (initial_index + j * j) % capacity
+
+        if first_tombstone != -1:
+            ind = first_tombstone
+            self._tombstones -= 1
+        keys[ind] = key
+        self._values[ind] = value
+        hashes[ind] = hash_code
+        states[ind] = _LIVE
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the hash table.
+
+        Params: None
+
+        Returns: The load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+
+        Params: None
+
+        Returns: The number of empty buckets.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes the hash table to the given new capacity.
+        Stored hash codes are reused, so the hash function is not called again.
+
+        Params: The new capacity.
+
+        Returns: None
+        """
+        if new_capacity < self._size:
+            return
+
+        if self._is_prime(new_capacity) is False:
+            new_capacity = self._next_prime(new_capacity)
+
+        # grow the same way re-inserting through put() would
+        while self._size and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(2 * new_capacity)
+
+        old_keys, old_values = self._keys, self._values
+        old_hashes, old_states = self._hashes, self._states
+
+        self._capacity = new_capacity
+        self._keys = keys = [None] * new_capacity
+        self._values = values = [None] * new_capacity
+        self._hashes = hashes = array('Q', bytes(8 * new_capacity))
+        self._states = states = bytearray(new_capacity)
+        self._tombstones = 0
+
+        for old_index in range(len(old_states)):
+            if old_states[old_index] != _LIVE:
+                continue
+
+            hash_code = old_hashes[old_index]
+            initial_index = hash_code % new_capacity
+            j = 0
+            ind = initial_index
+            while states[ind] != _EMPTY:
+                j += 1
+                ind = (initial_index + j * j) % new_capacity
+
+            keys[ind] = old_keys[old_index]
+            values[ind] = old_values[old_index]
+            hashes[ind] = hash_code
+            states[ind] = _LIVE
+
+    def compact(self) -> None:
+        """
+        Rehashes the table at its current capacity, dropping all tombstones.
+
+        Params: None
+
+        Returns: None
+        """
+        self.resize_table(self._capacity)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the specified key.
+
+        Params: The key from the map.
+
+        Returns: The value associated with the key, or None if the key is not found.
+        """
+        ind = self._find_index(key, self._hash_function(key) & _HASH_MASK)
+        if ind == -1:
+            return None
+
+        return self._values[ind]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks if the specified key is in the hash map
+
+        Params: The key to check for.
+
+        Returns: True if the key is found in the hash table, False otherwise.
+        """
+        return self._find_index(key, self._hash_function(key) & _HASH_MASK) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key-value pair associated with the specified key.
+
+        Params: The key to be removed.
+
+        Returns: None
+        """
+        ind = self._find_index(key, self._hash_function(key) & _HASH_MASK)
+        if ind != -1:
+            self._states[ind] = _TOMBSTONE
+            self._values[ind] = None
+            self._size -= 1
+            self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        Clears the hash table.
+
+        Params: None
+
+        Returns: None
+        """
+        capacity = self._capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array containing tuples of all key-value pairs in the hash table.
+
+        Params: None
+
+        Returns: A dynamic array containing tuples of key-value pairs.
+        """
+        da = DynamicArray()
+
+        for ind in range(self._capacity):
+            if self._states[ind] == _LIVE:
+                da.append((self._keys[ind], self._values[ind]))
+
+        return da
+
+    def keys(self):
+        """
+        Yields the keys one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of keys.
+        """
+        for ind in range(self._capacity):
+            if self._states[ind] == _LIVE:
+                yield self._keys[ind]
+
+    def values(self):
+        """
+        Yields the values one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of values.
+        """
+        for ind in range(self._capacity):
+            if self._states[ind] == _LIVE:
+                yield self._values[ind]
+
+    def items(self):
+        """
+        Yields the key-value pairs one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of (key, value) tuples.
+        """
+        for ind in range(self._capacity):
+            if self._states[ind] == _LIVE:
+                yield self._keys[ind], self._values[ind]
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the live entries of the hash map.
+        Each iterator keeps its own position, so loops can be nested.
+
+        Params: None
+
+        Returns: A generator of HashEntry views.
+        """
+        for ind in range(self._capacity):
+            if self._states[ind] == _LIVE:
+                yield self._entry(ind)
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - resize example 2")
+    print("----------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(25, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - get_keys_and_values example 1")
+    print("------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys_and_values())
+
+    m.resize_table(2)
+    print(m.get_keys_and_values())
+
+    m.put('20', '200')
+    m.remove('1')
+    m.resize_table(12)
+    print(m.get_keys_and_values())
+
+    print("\nPDF - __iter__(), __next__() example 2")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
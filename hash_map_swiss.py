@@ -0,0 +1,450 @@
+# Description: HashMap implementation with Open Addressing in the style of SwissTable:
+# a control byte per slot holds 7 bits of the hash, and probing tests 16 slots at a time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from a6_include import (DynamicArray, HashEntry, FIBONACCI_MULTIPLIER,
+                        hash_function_1, hash_function_2, hash_function_xxh32)
+
+GROUP_SIZE = 16
+
+# control byte values; full slots hold a 7-bit tag (0-127) instead
+_EMPTY = 0x80
+_DELETED = 0xFE
+
+
+def _match_bytes(group: bytearray, byte: int) -> list:
+    """Return the positions in a group whose control byte equals byte."""
+    positions = []
+    pos = group.find(byte)
+    while pos != -1:
+        positions.append(pos)
+        pos = group.find(byte, pos + 1)
+    return positions
+
+
+def _has_bytes(group: bytearray, byte: int) -> bool:
+    """Return True if any control byte in a group equals byte."""
+    return byte in group
+
+
+def _match_numpy(group, byte: int) -> list:
+    """Return the positions in a group whose control byte equals byte."""
+    return np.flatnonzero(group == byte).tolist()
+
+
+def _has_numpy(group, byte: int) -> bool:
+    """Return True if any control byte in a group equals byte."""
+    return bool((group == byte).any())
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.875,
+                 use_numpy: bool = False) -> None:
+        """
+        Initialize new HashMap that keeps a control byte per slot and
+        probes whole groups of GROUP_SIZE slots. Keys are only compared on
+        slots whose 7-bit tag matches, so the table can run at max_load.
+        Groups are matched with bytes.find; use_numpy switches to NumPy
+        comparisons, which need NumPy installed and cost more per call.
+        """
+        if use_numpy and np is None:
+            raise ImportError("use_numpy=True requires NumPy")
+
+        self._use_numpy = use_numpy
+        if use_numpy:
+            self._match, self._has = _match_numpy, _has_numpy
+        else:
+            self._match, self._has = _match_bytes, _has_bytes
+
+        self._hash_function = function
+        self._max_load = max_load
+        self._allocate(self._groups_for(capacity) * GROUP_SIZE)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the OA HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = None
+            if self._ctrl[i] < _EMPTY:
+                entry = HashEntry(self._keys[i], self._values[i])
+            elif self._ctrl[i] == _DELETED:
+                entry = HashEntry(None, None)
+                entry.is_tombstone = True
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_tombstones(self) -> int:
+        """
+        Return number of deleted slots in the table
+        """
+        return self._tombstones
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _groups_for(capacity: int) -> int:
+        """
+        Returns the power of two number of groups needed for at least capacity slots.
+        """
+        groups = max(1, -(-capacity // GROUP_SIZE))
+        return 1 << (groups - 1).bit_length()
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the table with an empty one of the given capacity.
+
+        Params: The new capacity, a power of two multiple of GROUP_SIZE.
+
+        Returns: None
+        """
+        self._capacity = capacity
+        self._group_bits = (capacity // GROUP_SIZE).bit_length() - 1
+        if self._use_numpy:
+            self._ctrl = np.full(capacity, _EMPTY, dtype=np.uint8)
+        else:
+            self._ctrl = bytearray([_EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._size = 0
+        self._tombstones = 0
+
+    def _split_hash(self, hash_code: int) -> tuple:
+        """
+        Mixes a hash code and splits it into a home group and a 7-bit tag.
+
+        Params: The hash code of a key.
+
+        Returns: A tuple of the home group index and the tag.
+        """
+        mixed = (hash_code * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF
+        group = mixed >> (64 - self._group_bits) if self._group_bits else 0
+        tag = (mixed >> (57 - self._group_bits)) & 0x7F
+        return group, tag
+
+    def _find_index(self, key: str, hash_code: int) -> int:
+        """
+        Probes group by group, comparing keys only where the tag matches,
+        until the key is found or a group with an empty slot is reached.
+
+        Params:
+            - The key to search for.
+            - The key's hash code.
+
+        Returns: Index of the slot holding the key, or -1 if the key is not found.
+        """
+        group, tag = self._split_hash(hash_code)
+        ctrl, keys, hashes = self._ctrl, self._keys, self._hashes
+        match, has = self._match, self._has
+        mask = (self._capacity // GROUP_SIZE) - 1
+
+        for step in range(mask + 1):
+            base = group * GROUP_SIZE
+            slots = ctrl[base:base + GROUP_SIZE]
+            for pos in match(slots, tag):
+                ind = base + pos
+                if hashes[ind] == hash_code and keys[ind] == key:
+                    return ind
+            if has(slots, _EMPTY):
+                return -1
+            # triangular steps visit every group of a power of two table
+            group = (group + step + 1) & mask
+
+        return -1
+
+    def _free_index(self, hash_code: int) -> int:
+        """
+        Finds the first empty or deleted slot on the probe sequence of a hash code.
+
+        Params: The hash code of the key to store.
+
+        Returns: Index of the free slot.
+        """
+        group, tag = self._split_hash(hash_code)
+        ctrl = self._ctrl
+        mask = (self._capacity // GROUP_SIZE) - 1
+
+        step = 0
+        while True:
+            base = group * GROUP_SIZE
+            for pos in range(GROUP_SIZE):
+                if ctrl[base + pos] >= _EMPTY:
+                    return base + pos
+            step += 1
+            group = (group + step) & mask
+
+    def _store(self, ind: int, key: str, value: object, hash_code: int) -> None:
+        """
+        Writes a key-value pair into a free slot.
+
+        Params:
+            - The index of the free slot.
+            - The key.
+            - The value.
+            - The key's hash code.
+
+        Returns: None
+        """
+        if self._ctrl[ind] == _DELETED:
+            self._tombstones -= 1
+        self._ctrl[ind] = self._split_hash(hash_code)[1]
+        self._keys[ind] = key
+        self._values[ind] = value
+        self._hashes[ind] = hash_code
+        self._size += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Inserts a key-value pair into the hash map.
+
+        Params:
+            - The key to be inserted.
+            - The value associated with the key.
+
+        Returns: None
+        """
+        hash_code = self._hash_function(key)
+        ind = self._find_index(key, hash_code)
+        if ind != -1:
+            self._values[ind] = value
+            return
+
+        if (self._size + self._tombstones + 1) / self._capacity > self._max_load:
+            # grow if live entries alone are over half the limit, otherwise
+            # just rehash at the same capacity to drop deleted slots
+            if self._size + 1 > self._max_load * self._capacity / 2:
+                self.resize_table(2 * self._capacity)
+            else:
+                self.resize_table(self._capacity)
+
+        self._store(self._free_index(hash_code), key, value, hash_code)
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor of the hash table.
+
+        Params: None
+
+        Returns: The load factor.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+
+        Params: None
+
+        Returns: The number of empty buckets.
+        """
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Rehashes the table into at least new_capacity slots, rounded up to a
+        power of two number of groups with room for every entry under max_load.
+        Stored hash codes are reused, so the hash function is not called again.
+
+        Params: The new capacity.
+
+        Returns: None
+        """
+        groups = self._groups_for(new_capacity)
+        while self._size > self._max_load * groups * GROUP_SIZE:
+            groups *= 2
+
+        old_ctrl, old_keys = self._ctrl, self._keys
+        old_values, old_hashes = self._values, self._hashes
+
+        self._allocate(groups * GROUP_SIZE)
+        for ind in range(len(old_keys)):
+            if old_ctrl[ind] < _EMPTY:
+                hash_code = old_hashes[ind]
+                self._store(self._free_index(hash_code), old_keys[ind], old_values[ind], hash_code)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value associated with the specified key.
+
+        Params: The key from the map.
+
+        Returns: The value associated with the key, or None if the key is not found.
+        """
+        ind = self._find_index(key, self._hash_function(key))
+        if ind == -1:
+            return None
+
+        return self._values[ind]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Checks if the specified key is in the hash map
+
+        Params: The key to check for.
+
+        Returns: True if the key is found in the hash table, False otherwise.
+        """
+        return self._find_index(key, self._hash_function(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the key-value pair associated with the specified key.
+        The slot becomes empty again if its group still has an empty slot,
+        because no probe sequence can continue past such a group.
+
+        Params: The key to be removed.
+
+        Returns: None
+        """
+        ind = self._find_index(key, self._hash_function(key))
+        if ind == -1:
+            return
+
+        base = ind - ind % GROUP_SIZE
+        if self._has(self._ctrl[base:base + GROUP_SIZE], _EMPTY):
+            self._ctrl[ind] = _EMPTY
+        else:
+            self._ctrl[ind] = _DELETED
+            self._tombstones += 1
+        self._keys[ind] = None
+        self._values[ind] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears the hash table.
+
+        Params: None
+
+        Returns: None
+        """
+        self._allocate(self._capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns a dynamic array containing tuples of all key-value pairs in the hash table.
+
+        Params: None
+
+        Returns: A dynamic array containing tuples of key-value pairs.
+        """
+        da = DynamicArray()
+
+        for ind in range(self._capacity):
+            if self._ctrl[ind] < _EMPTY:
+                da.append((self._keys[ind], self._values[ind]))
+
+        return da
+
+    def keys(self):
+        """
+        Yields the keys one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of keys.
+        """
+        for ind in range(self._capacity):
+            if self._ctrl[ind] < _EMPTY:
+                yield self._keys[ind]
+
+    def values(self):
+        """
+        Yields the values one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of values.
+        """
+        for ind in range(self._capacity):
+            if self._ctrl[ind] < _EMPTY:
+                yield self._values[ind]
+
+    def items(self):
+        """
+        Yields the key-value pairs one at a time without copying the table.
+
+        Params: None
+
+        Returns: A generator of (key, value) tuples.
+        """
+        for ind in range(self._capacity):
+            if self._ctrl[ind] < _EMPTY:
+                yield self._keys[ind], self._values[ind]
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the live entries of the hash map.
+        Each iterator keeps its own position, so loops can be nested.
+
+        Params: None
+
+        Returns: A generator of HashEntry views.
+        """
+        for ind in range(self._capacity):
+            if self._ctrl[ind] < _EMPTY:
+                yield HashEntry(self._keys[ind], self._values[ind])
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nPDF - put example 1")
+    print("-------------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nPDF - contains_key example 2")
+    print("----------------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nload factor example 1")
+    print("---------------------")
+    m = HashMap(16, hash_function_xxh32)
+    for i in range(10000):
+        m.put('key' + str(i), i)
+        if i % 2000 == 1999:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nPDF - __iter__(), __next__() example 2")
+    print("---------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    for item in m:
+        print('K:', item.key, 'V:', item.value)